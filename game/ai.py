@@ -1,186 +1,663 @@
-import glob
-import math
 import os
 import random
-from pathlib import Path
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from numba import njit
-from numba.typed import List, Dict
-from numpy import array, int16, uint8
+from numba.typed import List
+from numpy import array, float64, int8, int16, int64, uint8, uint64, zeros
 
-BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+from bitboard import check_five_through_field, count_stones, create_bitboard, fill_bitboard, make_move, unmake_move
+from formulas import (create_formula_counters, create_formula_family, create_formula_index,
+                      initialize_formula_counters, load_formulas, update_formula_counters)
+from opening_book import get_opening_book_field, load_opening_book
+from transposition_table import (EXACT_BOUND, LOWER_BOUND, UPPER_BOUND, compute_hash_key, create_transposition_table,
+                                 create_zobrist_keys, probe_transposition_table, start_new_search,
+                                 store_transposition_table)
+
+MAIN_FORMULAS = 0
+FOUR_CHECKER_FORMULAS = 1
+THREE_CHECKER_FORMULAS = 2
+NEARBY_FIELD_CHECKER_FORMULAS = 3
+EVALUATION_FORMULAS = 4
+MOVES_TO_GO = 20
+MIN_MOVE_TIME = 0.1
+TIME_SAFETY_MARGIN = 1
+TRANSPOSITION_FIELD_PRIORITY = 3
+FIRST_KILLER_PRIORITY = 2
+SECOND_KILLER_PRIORITY = 1
+ROOT_ALPHA_MARGIN = 0.005
+PVS_WINDOW = 0.001
+ASPIRATION_WINDOW = 0.05
+NUMBER_OF_WORKERS = os.cpu_count() or 1
+VCF_DEPTH = 12
+VCF_NODE_LIMIT = 20000
+NODES_STATISTIC = 0
+BETA_CUTOFFS_STATISTIC = 1
+TRANSPOSITION_HITS_STATISTIC = 2
+PREPARE_FIELDS_STATISTIC = 3
+MAIN_FORMULAS_STATISTIC = 4
+ADDITIONAL_FORMULAS_STATISTIC = 5
+EVALUATION_FORMULAS_STATISTIC = 6
+LITERALS_STATISTIC = 7
+SEARCH_STATISTICS = ("nodes", "beta_cutoffs", "transposition_hits", "prepare_fields_calls",
+                     "check_main_formulas_calls", "check_additional_formulas_calls",
+                     "check_evaluation_formulas_calls", "literals")
 
 
 class AI:
-    def __init__(self, board_size):
+    def __init__(self, board_size, number_of_workers=NUMBER_OF_WORKERS, use_opening_book=True):
         self._board_size = board_size
-        self._main_formulas_dict = self._prepare_main_formulas()
-        self._evaluation_formulas_dict = self._prepare_evaluation_formulas()
-        self._four_checker_formulas_dict = self._prepare_additional_formulas("4_checker")
-        self._three_checker_formulas_dict = self._prepare_additional_formulas("3_checker")
-        self._nearby_field_checker_formulas_dict = self._prepare_additional_formulas("nearby_field_checker")
+        self._number_of_workers = max(number_of_workers, 1)
+        formulas = load_formulas(self._board_size)
+        self._search_formulas = (formulas["main"], formulas["4_checker"], formulas["3_checker"],
+                                 formulas["nearby_field_checker"], formulas["evaluation"])
+        self._formula_indexes = tuple(create_formula_index(search_formulas, (self._board_size ** 2) * 2) for
+                                      search_formulas in self._search_formulas)
+        self._disabled_main_formulas = create_formula_family([[] for _ in range((self._board_size ** 2) * 2)])
+        self._disabled_main_formula_index = create_formula_index(self._disabled_main_formulas,
+                                                                 (self._board_size ** 2) * 2)
+        self._threat_formula_players = (get_formula_players(formulas["4_checker"]),
+                                        get_formula_players(formulas["3_checker"]))
+        self._zobrist_keys = create_zobrist_keys((self._board_size ** 2) * 2)
+        self._opening_book = load_opening_book(self._board_size) if use_opening_book else None
+        self._transposition_tables = {}
+        self._pondering_lock = threading.RLock()
+        self._pondering_thread = None
+        self._pondering_stop_search = None
+        self._pondering_results = {}
+        self.last_search_statistics = None
         self._initialize_components()
 
-    def _create_formulas(self, number_of_clauses, data):
-        raw_formulas = [data[i:i + int(number_of_clauses)] for i in range(0, len(data), int(number_of_clauses))]
-        formulas = List()
-        for raw_formula in raw_formulas:
-            formula = List()
-            for raw_clause in raw_formula:
-                formula.append(array([int(literal) for literal in raw_clause.split()], dtype=int16))
-            formulas.append(formula)
-        return formulas
-
-    def _prepare_main_formulas(self):
-        fields = [index + 1 for index in range(self._board_size ** 2)]
-        main_formulas_dict = Dict()
-        for f in fields:
-            with open(BASE_DIR.joinpath(f"cnf/main/{f}_0.cnf"), "r") as file:
-                all_data = [line.strip() for line in file if not line.startswith('c')]
-                zeros = List(self._create_formulas(all_data[0].split()[2], all_data[1:]))
-            with open(BASE_DIR.joinpath(f"cnf/main/{f}_1.cnf"), "r") as file:
-                all_data = [line.strip() for line in file if not line.startswith('c')]
-                ones = List(self._create_formulas(all_data[0].split()[2], all_data[1:]))
-            main_formulas_dict[f] = zeros, ones
-        return main_formulas_dict
-
-    def _prepare_evaluation_formulas(self):
-        evaluation_formulas_dict = Dict()
-        with open(BASE_DIR.joinpath("cnf/evaluation/evaluation_player_0.cnf"), "r") as file:
-            all_data = [line.strip() for line in file if not line.startswith('c')]
-            evaluation_formulas_dict[0] = List(self._create_formulas(all_data[0].split()[2], all_data[1:]))
-        with open(BASE_DIR.joinpath("cnf/evaluation/evaluation_player_1.cnf"), "r") as file:
-            all_data = [line.strip() for line in file if not line.startswith('c')]
-            evaluation_formulas_dict[1] = List(self._create_formulas(all_data[0].split()[2], all_data[1:]))
-        return evaluation_formulas_dict
-
-    def _prepare_additional_formulas(self, formula_type):
-        fields = [index + 1 for index in range(self._board_size ** 2)]
-        additional_formulas_dict = Dict()
-        for f in fields:
-            files = glob.glob(str(BASE_DIR.joinpath(f"cnf/additional/{f}_{formula_type}*.cnf")))
-            formulas = []
-            for file in files:
-                with open(file, "r") as cnf_file:
-                    all_data = [line.strip() for line in cnf_file if not line.startswith('c')]
-                    formulas += self._create_formulas(all_data[0].split()[2], all_data[1:])
-            additional_formulas_dict[f] = List(formulas)
-        return additional_formulas_dict
+    def _get_transposition_table(self, computer_position_in_game_state, player_options_tuple, worker):
+        search_options = ((computer_position_in_game_state,) + tuple(player_options_tuple[1:6]) +
+                          (player_options_tuple[8], worker))
+        if search_options not in self._transposition_tables:
+            self._transposition_tables[search_options] = create_transposition_table()
+        transposition_table = self._transposition_tables[search_options]
+        start_new_search(transposition_table)
+        return transposition_table
+
+    def _prepare_formula_counters(self, game_state, main_formulas_required):
+        search_formulas = self._search_formulas
+        formula_indexes = self._formula_indexes
+        if not main_formulas_required:
+            search_formulas = (self._disabled_main_formulas,) + search_formulas[1:]
+            formula_indexes = (self._disabled_main_formula_index,) + formula_indexes[1:]
+        formula_counters = tuple(create_formula_counters(formulas) for formulas in search_formulas)
+        for formulas, counters in zip(search_formulas, formula_counters):
+            initialize_formula_counters(formulas, counters, game_state)
+        return formula_indexes, formula_counters
 
     def _initialize_components(self):
-        game_state = [0 for _ in range((self._board_size ** 2) * 2)]
+        game_state = array([0 for _ in range((self._board_size ** 2) * 2)], dtype=int16)
+        formula_indexes, formula_counters = self._prepare_formula_counters(game_state, True)
         non_corrupted_fields = [i for i in range(1, (self._board_size ** 2) + 1) if
                                 not game_state[(i - 1) * 2] == 1 and not game_state[((i - 1) * 2) + 1] == 1]
-        random.choice(check_main_formulas(self._main_formulas_dict, array(non_corrupted_fields, dtype=uint8),
-                                          array(game_state, dtype=int16))[:10])
-        minmax(self._four_checker_formulas_dict, self._three_checker_formulas_dict,
-               self._nearby_field_checker_formulas_dict, self._main_formulas_dict, self._evaluation_formulas_dict,
-               array(game_state, dtype=int16), 0, 2, 15, False, 2, "on", "fields chosen by formulas", -2, 2, "all")
+        random.choice(check_main_formulas(formula_counters[MAIN_FORMULAS][2], array(non_corrupted_fields))[:10])
+        find_forcing_field(formula_indexes, formula_counters, self._threat_formula_players, game_state,
+                           create_bitboard(self._board_size), create_stop_search(), zeros(1, dtype=int64), 0,
+                           self._board_size)
+        search_root_field(create_transposition_table(2), self._zobrist_keys,
+                          uint64(compute_hash_key(self._zobrist_keys, game_state)),
+                          create_move_ordering(self._board_size), formula_indexes, formula_counters, game_state,
+                          create_bitboard(self._board_size), create_stop_search(), create_search_statistics(), 1, 0, 2,
+                          self._board_size, 2, "on", "fields chosen by formulas", -2.0, 2.0, False, "all", "pvs")
+
+    def _create_search_states(self, game_state, formula_counters, computer_position_in_game_state,
+                              player_options_tuple):
+        search_states = []
+        for worker in range(self._number_of_workers):
+            bitboard = create_bitboard(self._board_size)
+            fill_bitboard(bitboard, game_state, self._board_size)
+            search_states.append((self._get_transposition_table(computer_position_in_game_state, player_options_tuple,
+                                                                worker),
+                                  create_move_ordering(self._board_size), game_state.copy(), bitboard,
+                                  tuple(tuple(counters.copy() for counters in family_counters) for family_counters in
+                                        formula_counters), create_search_statistics()))
+        return search_states
 
-    def get_best_move(self, game_state, computer_position_in_game_state, player_options_tuple):
+    def _search_root_fields(self, search_states, fields, depth, hash_key, formula_indexes, stop_search,
+                            computer_position_in_game_state, player_options_tuple, alpha, beta):
+        field_scores = [None for _ in fields]
+        shared_state = {"alpha": alpha, "next_field": 0, "winning_field": len(fields)}
+        lock = threading.Lock()
+
+        def search_fields(search_state):
+            transposition_table, move_ordering, game_state, bitboard, formula_counters, search_statistics = \
+                search_state
+            while not stop_search[0]:
+                with lock:
+                    index = shared_state["next_field"]
+                    if index >= shared_state["winning_field"]:
+                        return
+                    shared_state["next_field"] += 1
+                    field_alpha = shared_state["alpha"]
+                score = search_root_field(transposition_table, self._zobrist_keys, hash_key, move_ordering,
+                                          formula_indexes, formula_counters, game_state, bitboard, stop_search,
+                                          search_statistics, fields[index], computer_position_in_game_state, depth,
+                                          self._board_size, player_options_tuple[3], player_options_tuple[2],
+                                          player_options_tuple[1], field_alpha, beta,
+                                          player_options_tuple[8] == "pvs" and field_alpha > alpha,
+                                          player_options_tuple[5], player_options_tuple[8])
+                if stop_search[0]:
+                    return
+                with lock:
+                    field_scores[index] = score
+                    shared_state["alpha"] = max(shared_state["alpha"], score - ROOT_ALPHA_MARGIN)
+                    if score == 1:
+                        shared_state["winning_field"] = min(shared_state["winning_field"], index)
+
+        if len(search_states) == 1:
+            search_fields(search_states[0])
+        else:
+            with ThreadPoolExecutor(len(search_states)) as executor:
+                list(executor.map(search_fields, search_states))
+        return field_scores
+
+    def _search_best_move(self, game_state, computer_position_in_game_state, player_options_tuple, stop_search,
+                          search_summary):
+        if self._opening_book is not None:
+            opening_book_field = get_opening_book_field(self._opening_book, self._zobrist_keys, game_state)
+            if opening_book_field:
+                search_summary["source"] = "opening book"
+                return opening_book_field
         non_corrupted_fields = [i for i in range(1, (self._board_size ** 2) + 1) if
                                 not game_state[(i - 1) * 2] == 1 and not game_state[((i - 1) * 2) + 1] == 1]
+        game_state = array(game_state, dtype=int16)
+        main_formulas_required = sum(game_state) == 0 or (player_options_tuple[1] == "fields chosen by formulas" and
+                                                          player_options_tuple[5] != "artificial")
+        formula_indexes, formula_counters = self._prepare_formula_counters(game_state, main_formulas_required)
         if sum(game_state) == 0:
-            result = check_main_formulas(self._main_formulas_dict, array(non_corrupted_fields, dtype=uint8),
-                                         array(game_state, dtype=int16))
+            result = check_main_formulas(formula_counters[MAIN_FORMULAS][2], array(non_corrupted_fields))
+            search_summary["source"] = "main formulas"
             return random.choice(result[:10])[1]
         else:
-            field_scores = []
-            fields = prepare_fields(self._four_checker_formulas_dict, self._three_checker_formulas_dict,
-                                    self._nearby_field_checker_formulas_dict, self._main_formulas_dict,
-                                    self._board_size, array(game_state, dtype=int16), player_options_tuple[3],
-                                    player_options_tuple[1], player_options_tuple[5])
-            for field in fields:
-                game_state[((field - 1) * 2) + computer_position_in_game_state] = 1
-                score = minmax(self._four_checker_formulas_dict, self._three_checker_formulas_dict,
-                               self._nearby_field_checker_formulas_dict, self._main_formulas_dict,
-                               self._evaluation_formulas_dict, array(game_state, dtype=int16),
-                               computer_position_in_game_state, player_options_tuple[4], self._board_size, False,
-                               player_options_tuple[3], player_options_tuple[2], player_options_tuple[1], -2, 2,
-                               player_options_tuple[5])
-                game_state[((field - 1) * 2) + computer_position_in_game_state] = 0
-                if score == 1:
-                    return field
+            bitboard = create_bitboard(self._board_size)
+            fill_bitboard(bitboard, game_state, self._board_size)
+            vcf_nodes = zeros(1, dtype=int64)
+            forcing_field = find_forcing_field(formula_indexes, formula_counters, self._threat_formula_players,
+                                               game_state, bitboard, stop_search, vcf_nodes,
+                                               computer_position_in_game_state, self._board_size)
+            search_summary["vcf_nodes"] = int(vcf_nodes[0])
+            if forcing_field:
+                search_summary["source"] = "forcing sequence"
+                return forcing_field
+            search_summary["source"] = "minmax"
+            hash_key = uint64(compute_hash_key(self._zobrist_keys, game_state))
+            search_states = self._create_search_states(game_state, formula_counters, computer_position_in_game_state,
+                                                       player_options_tuple)
+            fields = prepare_fields(formula_counters, self._board_size, game_state, player_options_tuple[3],
+                                    player_options_tuple[1], player_options_tuple[5], search_states[0][5])
+            best_fields = [fields[0]]
+            best_score = None
+            for depth in range(1, player_options_tuple[4] + 1):
+                if best_score is None or player_options_tuple[8] != "pvs":
+                    alpha, beta = -2.0, 2.0
                 else:
-                    field_scores.append((score, field))
-            max_score = max(field_scores)[0]
-            return random.choice([field[1] for field in field_scores if field[0] == max_score])
-
-
-@njit(nogil=True)
-def minmax(four_checker_formulas_dict, three_checker_formulas_dict, nearby_field_checker_formulas_dict,
-           main_formulas_dict, evaluation_formulas_dict, game_state, computer_position_in_game_state, depth, board_size,
-           maximizer, minmax_number_of_fields_value, evaluation_function_option_value, minmax_option_value, alpha,
-           beta, formulas_selection_value):
-    score = get_score(evaluation_formulas_dict, game_state, board_size, computer_position_in_game_state,
-                      evaluation_function_option_value)
-    if depth == 1 or score == 1 or score == -1 or sum(game_state) == (board_size ** 2):
-        return score
-    if maximizer:
-        best_score = -2
-        bonus = 0 + computer_position_in_game_state
-        fields = prepare_fields(four_checker_formulas_dict, three_checker_formulas_dict,
-                                nearby_field_checker_formulas_dict, main_formulas_dict, board_size, game_state,
-                                minmax_number_of_fields_value, minmax_option_value, formulas_selection_value)
-        for field in fields:
-            game_state[((field - 1) * 2) + bonus] = 1
-            minmax_result = minmax(four_checker_formulas_dict, three_checker_formulas_dict,
-                                   nearby_field_checker_formulas_dict, main_formulas_dict, evaluation_formulas_dict,
-                                   game_state, computer_position_in_game_state, depth - 1, board_size, False,
-                                   minmax_number_of_fields_value, evaluation_function_option_value, minmax_option_value,
-                                   alpha, beta, formulas_selection_value)
-            game_state[((field - 1) * 2) + bonus] = 0
-            if minmax_result == 1:
-                return minmax_result
-            best_score = max(best_score, minmax_result)
-            alpha = max(alpha, minmax_result)
-            if beta <= alpha:
-                break
-        return best_score
-    else:
-        best_score = 2
-        bonus = 1 - computer_position_in_game_state
-        fields = prepare_fields(four_checker_formulas_dict, three_checker_formulas_dict,
-                                nearby_field_checker_formulas_dict, main_formulas_dict, board_size, game_state,
-                                minmax_number_of_fields_value, minmax_option_value, formulas_selection_value)
-        for field in fields:
-            game_state[((field - 1) * 2) + bonus] = 1
-            minmax_result = minmax(four_checker_formulas_dict, three_checker_formulas_dict,
-                                   nearby_field_checker_formulas_dict, main_formulas_dict, evaluation_formulas_dict,
-                                   game_state, computer_position_in_game_state, depth - 1, board_size, True,
-                                   minmax_number_of_fields_value, evaluation_function_option_value, minmax_option_value,
-                                   alpha, beta, formulas_selection_value)
-            game_state[((field - 1) * 2) + bonus] = 0
-            if minmax_result == -1:
-                return minmax_result
-            best_score = min(best_score, minmax_result)
-            beta = min(beta, minmax_result)
-            if beta <= alpha:
-                break
-        return best_score
-
-
-@njit(nogil=True)
-def prepare_fields(four_checker_formulas_dict, three_checker_formulas_dict, nearby_field_checker_formulas_dict,
-                   main_formulas_dict, board_size, game_state, minmax_number_of_fields_value, minmax_option_value,
-                   formulas_selection_value):
+                    alpha, beta = best_score - ASPIRATION_WINDOW, best_score + ASPIRATION_WINDOW
+                while True:
+                    field_scores = self._search_root_fields(search_states, fields, depth, hash_key, formula_indexes,
+                                                            stop_search, computer_position_in_game_state,
+                                                            player_options_tuple, alpha, beta)
+                    field_scores = [(score, field) for score, field in zip(field_scores, fields) if score is not None]
+                    update_search_summary(search_summary, search_states, depth)
+                    for score, field in field_scores:
+                        if score == 1:
+                            return field
+                    if stop_search[0] or not field_scores or (alpha, beta) == (-2.0, 2.0) or \
+                            alpha < max(field_scores)[0] < beta:
+                        break
+                    alpha, beta = -2.0, 2.0
+                if field_scores and (not stop_search[0] or depth == 1):
+                    best_score = max(field_scores)[0]
+                    best_fields = [field[1] for field in field_scores if field[0] == best_score]
+                if stop_search[0]:
+                    break
+            return random.choice(best_fields)
+
+    def _ponder(self, game_state, computer_position_in_game_state, player_options_tuple, stop_search):
+        opponent_position_in_game_state = 1 - computer_position_in_game_state
+        main_formulas_required = player_options_tuple[1] == "fields chosen by formulas" and \
+            player_options_tuple[5] != "artificial"
+        _, formula_counters = self._prepare_formula_counters(array(game_state, dtype=int16), main_formulas_required)
+        replies = prepare_fields(formula_counters, self._board_size, array(game_state, dtype=int16),
+                                 player_options_tuple[3], player_options_tuple[1], player_options_tuple[5],
+                                 create_search_statistics())
+        for reply in replies:
+            pondering_game_state = list(game_state)
+            pondering_game_state[((reply - 1) * 2) + opponent_position_in_game_state] = 1
+            search_summary = create_search_summary()
+            start_time = time.perf_counter()
+            field = self._search_best_move(pondering_game_state, computer_position_in_game_state, player_options_tuple,
+                                           stop_search, search_summary)
+            if stop_search[0]:
+                return
+            finish_search_summary(search_summary, time.perf_counter() - start_time)
+            search_summary["pondered"] = True
+            self._pondering_results[(tuple(pondering_game_state), computer_position_in_game_state,
+                                     tuple(player_options_tuple))] = (field, search_summary)
+
+    def start_pondering(self, game_state, computer_position_in_game_state, player_options_tuple):
+        with self._pondering_lock:
+            self.stop_pondering()
+            self._pondering_results = {}
+            self._pondering_stop_search = create_stop_search()
+            self._pondering_thread = threading.Thread(target=self._ponder, args=(
+                list(game_state), computer_position_in_game_state, player_options_tuple, self._pondering_stop_search))
+            self._pondering_thread.daemon = True
+            self._pondering_thread.start()
+
+    def stop_pondering(self):
+        with self._pondering_lock:
+            if self._pondering_thread is not None:
+                self._pondering_stop_search.fill(1)
+                self._pondering_thread.join()
+                self._pondering_thread = None
+
+    def clear_transposition_tables(self):
+        self._transposition_tables = {}
+
+    def get_best_move(self, game_state, computer_position_in_game_state, player_options_tuple, remaining_time=None,
+                      stop_search=None):
+        self.stop_pondering()
+        pondering_key = (tuple(game_state), computer_position_in_game_state, tuple(player_options_tuple))
+        if pondering_key in self._pondering_results:
+            field, self.last_search_statistics = self._pondering_results[pondering_key]
+            return field
+        search_summary = create_search_summary()
+        start_time = time.perf_counter()
+        if stop_search is None:
+            stop_search = create_stop_search()
+        timer = threading.Timer(get_move_time_budget(
+            player_options_tuple[6] if remaining_time is None else remaining_time, player_options_tuple[7]),
+            stop_search.fill, (1,))
+        timer.daemon = True
+        timer.start()
+        try:
+            return self._search_best_move(game_state, computer_position_in_game_state, player_options_tuple,
+                                          stop_search, search_summary)
+        finally:
+            timer.cancel()
+            finish_search_summary(search_summary, time.perf_counter() - start_time)
+            self.last_search_statistics = search_summary
+
+
+def get_formula_players(formulas):
+    literals, clause_offsets, formula_offsets, _ = formulas
+    return (literals[clause_offsets[formula_offsets[:-1]]] % 2).astype(int8)
+
+
+def create_stop_search():
+    return zeros(1, dtype=uint8)
+
+
+def create_search_statistics():
+    return zeros(len(SEARCH_STATISTICS), dtype=int64)
+
+
+def create_search_summary():
+    search_summary = {name: 0 for name in SEARCH_STATISTICS}
+    search_summary.update({"source": None, "pondered": False, "vcf_nodes": 0, "nodes_per_depth": [],
+                           "wall_time": 0.0, "nodes_per_second": 0.0})
+    return search_summary
+
+
+def update_search_summary(search_summary, search_states, depth):
+    search_statistics = sum(search_state[5] for search_state in search_states)
+    nodes_per_depth = search_summary["nodes_per_depth"]
+    nodes_per_depth.extend(0 for _ in range(depth - len(nodes_per_depth)))
+    nodes_per_depth[depth - 1] += int(search_statistics[NODES_STATISTIC]) - search_summary["nodes"]
+    search_summary.update((name, int(value)) for name, value in zip(SEARCH_STATISTICS, search_statistics))
+
+
+def finish_search_summary(search_summary, wall_time):
+    search_summary["wall_time"] = wall_time
+    search_summary["nodes_per_second"] = search_summary["nodes"] / wall_time if wall_time > 0 else 0.0
+
+
+def get_move_time_budget(remaining_time, increment_time):
+    move_time = min((remaining_time / MOVES_TO_GO) + increment_time, remaining_time - TIME_SAFETY_MARGIN)
+    return max(move_time, MIN_MOVE_TIME)
+
+
+@njit(nogil=True, cache=True)
+def apply_move(formula_indexes, formula_counters, game_state, bitboard, field, player, board_size):
+    column = ((field - 1) * 2) + player
+    game_state[column] = 1
+    make_move(bitboard, field, player, board_size)
+    number_of_literals = 0
+    for i in range(len(formula_indexes)):
+        number_of_literals += update_formula_counters(formula_indexes[i], formula_counters[i], column, 1)
+    return number_of_literals
+
+
+@njit(nogil=True, cache=True)
+def revert_move(formula_indexes, formula_counters, game_state, bitboard, field, player, board_size):
+    column = ((field - 1) * 2) + player
+    game_state[column] = 0
+    unmake_move(bitboard, field, player, board_size)
+    number_of_literals = 0
+    for i in range(len(formula_indexes)):
+        number_of_literals += update_formula_counters(formula_indexes[i], formula_counters[i], column, -1)
+    return number_of_literals
+
+
+def create_move_ordering(board_size):
+    return zeros(((board_size ** 2) + 1, 2), dtype=int16), zeros((2, (board_size ** 2) + 1), dtype=int64)
+
+
+@njit(nogil=True, cache=True)
+def order_fields(fields, move_ordering, ply, player, transposition_field, main_scores):
+    killer_moves, history = move_ordering
+    number_of_fields = len(fields)
+    ordered_fields = zeros(number_of_fields, dtype=int64)
+    priorities = zeros(number_of_fields, dtype=int64)
+    history_scores = zeros(number_of_fields, dtype=int64)
+    main_formula_scores = zeros(number_of_fields, dtype=int64)
+    for i in range(number_of_fields):
+        field = fields[i]
+        if field == transposition_field:
+            priority = TRANSPOSITION_FIELD_PRIORITY
+        elif field == killer_moves[ply, 0]:
+            priority = FIRST_KILLER_PRIORITY
+        elif field == killer_moves[ply, 1]:
+            priority = SECOND_KILLER_PRIORITY
+        else:
+            priority = 0
+        history_score = history[player, field]
+        main_formula_score = main_scores[((field - 1) * 2) + 1] - main_scores[(field - 1) * 2]
+        j = i
+        while j > 0 and (priorities[j - 1], history_scores[j - 1], main_formula_scores[j - 1]) < \
+                (priority, history_score, main_formula_score):
+            ordered_fields[j] = ordered_fields[j - 1]
+            priorities[j] = priorities[j - 1]
+            history_scores[j] = history_scores[j - 1]
+            main_formula_scores[j] = main_formula_scores[j - 1]
+            j -= 1
+        ordered_fields[j] = field
+        priorities[j] = priority
+        history_scores[j] = history_score
+        main_formula_scores[j] = main_formula_score
+    return ordered_fields
+
+
+@njit(nogil=True, cache=True)
+def update_move_ordering(move_ordering, ply, player, field, depth):
+    killer_moves, history = move_ordering
+    if killer_moves[ply, 0] != field:
+        killer_moves[ply, 1] = killer_moves[ply, 0]
+        killer_moves[ply, 0] = field
+    history[player, field] += depth * depth
+
+
+@njit(nogil=True, cache=True)
+def minmax(transposition_table, zobrist_keys, hash_key, move_ordering, formula_indexes, formula_counters, game_state,
+           bitboard, stop_search, search_statistics, last_field, computer_position_in_game_state, depth, board_size,
+           maximizer, minmax_number_of_fields_value, evaluation_function_option_value, minmax_option_value, alpha, beta,
+           formulas_selection_value, minmax_search_value):
+    hash_keys = zeros(depth + 1, dtype=uint64)
+    depths = zeros(depth + 1, dtype=int64)
+    maximizers = zeros(depth + 1, dtype=uint8)
+    last_fields = zeros(depth + 1, dtype=int64)
+    alphas = zeros(depth + 1, dtype=float64)
+    betas = zeros(depth + 1, dtype=float64)
+    alpha_originals = zeros(depth + 1, dtype=float64)
+    beta_originals = zeros(depth + 1, dtype=float64)
+    best_scores = zeros(depth + 1, dtype=float64)
+    best_fields = zeros(depth + 1, dtype=int64)
+    bonuses = zeros(depth + 1, dtype=int64)
+    numbers_of_stones = zeros(depth + 1, dtype=int64)
+    fields = [zeros(0, dtype=int64) for _ in range(depth + 1)]
+    field_indexes = zeros(depth + 1, dtype=int64)
+    researching = zeros(depth + 1, dtype=uint8)
+    hash_keys[0] = hash_key
+    depths[0] = depth
+    maximizers[0] = maximizer
+    last_fields[0] = last_field
+    alphas[0] = alpha
+    betas[0] = beta
+    ply = 0
+    entering = True
+    score = 0.0
+    while True:
+        if entering:
+            entering = False
+            if stop_search[0]:
+                score = 0.0
+                continue
+            search_statistics[NODES_STATISTIC] += 1
+            last_player = 1 - computer_position_in_game_state if maximizers[ply] else computer_position_in_game_state
+            score = get_score(formula_counters, bitboard, board_size, last_fields[ply], last_player,
+                              computer_position_in_game_state, evaluation_function_option_value, search_statistics)
+            number_of_stones = count_stones(bitboard)
+            if depths[ply] == 1 or score == 1 or score == -1 or number_of_stones == (board_size ** 2):
+                continue
+            entry = probe_transposition_table(transposition_table, hash_keys[ply])
+            if entry >= 0:
+                search_statistics[TRANSPOSITION_HITS_STATISTIC] += 1
+            if entry >= 0 and transposition_table[1][entry] >= depths[ply]:
+                bound = transposition_table[2][entry]
+                stored_score = transposition_table[3][entry]
+                if (bound == EXACT_BOUND or (bound == LOWER_BOUND and stored_score >= betas[ply]) or
+                        (bound == UPPER_BOUND and stored_score <= alphas[ply])):
+                    score = stored_score
+                    continue
+            transposition_field = transposition_table[4][entry] if entry >= 0 else 0
+            alpha_originals[ply] = alphas[ply]
+            beta_originals[ply] = betas[ply]
+            best_fields[ply] = 0
+            numbers_of_stones[ply] = number_of_stones
+            if maximizers[ply]:
+                best_scores[ply] = -2
+                bonuses[ply] = 0 + computer_position_in_game_state
+            else:
+                best_scores[ply] = 2
+                bonuses[ply] = 1 - computer_position_in_game_state
+            ordered_fields = order_fields(prepare_fields(formula_counters, board_size, game_state,
+                                                         minmax_number_of_fields_value, minmax_option_value,
+                                                         formulas_selection_value, search_statistics),
+                                          move_ordering, number_of_stones, bonuses[ply], transposition_field,
+                                          formula_counters[MAIN_FORMULAS][2])
+            fields[ply] = ordered_fields
+            field_indexes[ply] = 0
+        elif ply == 0:
+            return score
+        else:
+            ply -= 1
+            field = fields[ply][field_indexes[ply]]
+            null_window = minmax_search_value == "pvs" and field_indexes[ply] > 0
+            if null_window and not researching[ply] and alphas[ply] < score < betas[ply]:
+                researching[ply] = 1
+                hash_keys[ply + 1] = hash_keys[ply] ^ zobrist_keys[((field - 1) * 2) + bonuses[ply]]
+                depths[ply + 1] = depths[ply] - 1
+                maximizers[ply + 1] = not maximizers[ply]
+                last_fields[ply + 1] = field
+                alphas[ply + 1] = alphas[ply]
+                betas[ply + 1] = betas[ply]
+                ply += 1
+                entering = True
+                continue
+            researching[ply] = 0
+            search_statistics[LITERALS_STATISTIC] += revert_move(formula_indexes, formula_counters, game_state,
+                                                                 bitboard, field, bonuses[ply], board_size)
+            if stop_search[0]:
+                score = 0.0
+                continue
+            if score == (1 if maximizers[ply] else -1):
+                update_move_ordering(move_ordering, numbers_of_stones[ply], bonuses[ply], field, depths[ply])
+                store_transposition_table(transposition_table, hash_keys[ply], depths[ply], EXACT_BOUND, score, field)
+                continue
+            if maximizers[ply]:
+                if score > best_scores[ply]:
+                    best_scores[ply] = score
+                    best_fields[ply] = field
+                alphas[ply] = max(alphas[ply], score)
+            else:
+                if score < best_scores[ply]:
+                    best_scores[ply] = score
+                    best_fields[ply] = field
+                betas[ply] = min(betas[ply], score)
+            if betas[ply] <= alphas[ply]:
+                search_statistics[BETA_CUTOFFS_STATISTIC] += 1
+                update_move_ordering(move_ordering, numbers_of_stones[ply], bonuses[ply], field, depths[ply])
+                field_indexes[ply] = len(fields[ply])
+            else:
+                field_indexes[ply] += 1
+        if field_indexes[ply] < len(fields[ply]):
+            field = fields[ply][field_indexes[ply]]
+            null_window = minmax_search_value == "pvs" and field_indexes[ply] > 0
+            search_statistics[LITERALS_STATISTIC] += apply_move(formula_indexes, formula_counters, game_state,
+                                                                bitboard, field, bonuses[ply], board_size)
+            hash_keys[ply + 1] = hash_keys[ply] ^ zobrist_keys[((field - 1) * 2) + bonuses[ply]]
+            depths[ply + 1] = depths[ply] - 1
+            maximizers[ply + 1] = not maximizers[ply]
+            last_fields[ply + 1] = field
+            if maximizers[ply]:
+                alphas[ply + 1] = alphas[ply]
+                betas[ply + 1] = alphas[ply] + PVS_WINDOW if null_window else betas[ply]
+            else:
+                alphas[ply + 1] = betas[ply] - PVS_WINDOW if null_window else alphas[ply]
+                betas[ply + 1] = betas[ply]
+            ply += 1
+            entering = True
+            continue
+        if best_scores[ply] <= alpha_originals[ply]:
+            bound = UPPER_BOUND
+        elif best_scores[ply] >= beta_originals[ply]:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT_BOUND
+        store_transposition_table(transposition_table, hash_keys[ply], depths[ply], bound, best_scores[ply],
+                                  best_fields[ply])
+        score = best_scores[ply]
+
+
+@njit(nogil=True, cache=True)
+def search_root_field(transposition_table, zobrist_keys, hash_key, move_ordering, formula_indexes, formula_counters,
+                      game_state, bitboard, stop_search, search_statistics, field, computer_position_in_game_state,
+                      depth, board_size, minmax_number_of_fields_value, evaluation_function_option_value,
+                      minmax_option_value, alpha, beta, null_window, formulas_selection_value, minmax_search_value):
+    field_hash_key = hash_key ^ zobrist_keys[((field - 1) * 2) + computer_position_in_game_state]
+    search_statistics[LITERALS_STATISTIC] += apply_move(formula_indexes, formula_counters, game_state, bitboard, field,
+                                                        computer_position_in_game_state, board_size)
+    score = minmax(transposition_table, zobrist_keys, field_hash_key, move_ordering, formula_indexes, formula_counters,
+                   game_state, bitboard, stop_search, search_statistics, field, computer_position_in_game_state, depth,
+                   board_size, False, minmax_number_of_fields_value, evaluation_function_option_value,
+                   minmax_option_value, alpha, alpha + PVS_WINDOW if null_window else beta, formulas_selection_value,
+                   minmax_search_value)
+    if null_window and alpha < score < beta:
+        score = minmax(transposition_table, zobrist_keys, field_hash_key, move_ordering, formula_indexes,
+                       formula_counters, game_state, bitboard, stop_search, search_statistics, field,
+                       computer_position_in_game_state, depth, board_size, False, minmax_number_of_fields_value,
+                       evaluation_function_option_value, minmax_option_value, alpha, beta, formulas_selection_value,
+                       minmax_search_value)
+    search_statistics[LITERALS_STATISTIC] += revert_move(formula_indexes, formula_counters, game_state, bitboard, field,
+                                                         computer_position_in_game_state, board_size)
+    return score
+
+
+@njit(nogil=True, cache=True)
+def get_threat_fields(formula_index, formula_counters, formula_players, game_state, player):
+    formula_groups = formula_index[4]
+    satisfied_formulas = formula_counters[1]
+    fields = List()
+    for formula in range(len(satisfied_formulas)):
+        if satisfied_formulas[formula] == 0 and formula_players[formula] == player:
+            field = formula_groups[formula] + 1
+            if game_state[(field - 1) * 2] == 0 and game_state[((field - 1) * 2) + 1] == 0 and \
+                    (len(fields) == 0 or fields[-1] != field):
+                fields.append(field)
+    return fields
+
+
+@njit(nogil=True, cache=True)
+def get_five_fields(formula_indexes, formula_counters, threat_formula_players, game_state, bitboard, player,
+                    board_size):
+    fields = List()
+    for field in get_threat_fields(formula_indexes[FOUR_CHECKER_FORMULAS], formula_counters[FOUR_CHECKER_FORMULAS],
+                                   threat_formula_players[0], game_state, player):
+        make_move(bitboard, field, player, board_size)
+        if check_five_through_field(bitboard, field, player, board_size):
+            fields.append(field)
+        unmake_move(bitboard, field, player, board_size)
+    return fields
+
+
+@njit(nogil=True, cache=True)
+def search_vcf(formula_indexes, formula_counters, threat_formula_players, game_state, bitboard, stop_search,
+               vcf_nodes, attacker, depth, board_size):
+    five_fields = get_five_fields(formula_indexes, formula_counters, threat_formula_players, game_state, bitboard,
+                                  attacker, board_size)
+    if len(five_fields) > 0:
+        return five_fields[0]
+    defender = 1 - attacker
+    if depth == 0 or stop_search[0] or vcf_nodes[0] >= VCF_NODE_LIMIT or \
+            len(get_five_fields(formula_indexes, formula_counters, threat_formula_players, game_state, bitboard,
+                                defender, board_size)) > 0:
+        return 0
+    four_fields = get_threat_fields(formula_indexes[THREE_CHECKER_FORMULAS], formula_counters[THREE_CHECKER_FORMULAS],
+                                    threat_formula_players[1], game_state, attacker)
+    for field in four_fields:
+        vcf_nodes[0] += 1
+        apply_move(formula_indexes, formula_counters, game_state, bitboard, field, attacker, board_size)
+        five_fields = get_five_fields(formula_indexes, formula_counters, threat_formula_players, game_state, bitboard,
+                                      attacker, board_size)
+        winning_field = 0
+        if len(five_fields) > 1:
+            winning_field = field
+        elif len(five_fields) == 1:
+            apply_move(formula_indexes, formula_counters, game_state, bitboard, five_fields[0], defender, board_size)
+            if search_vcf(formula_indexes, formula_counters, threat_formula_players, game_state, bitboard,
+                          stop_search, vcf_nodes, attacker, depth - 1, board_size):
+                winning_field = field
+            revert_move(formula_indexes, formula_counters, game_state, bitboard, five_fields[0], defender, board_size)
+        revert_move(formula_indexes, formula_counters, game_state, bitboard, field, attacker, board_size)
+        if winning_field:
+            return winning_field
+    return 0
+
+
+def find_forcing_field(formula_indexes, formula_counters, threat_formula_players, game_state, bitboard, stop_search,
+                       vcf_nodes, computer_position_in_game_state, board_size):
+    for player in (computer_position_in_game_state, 1 - computer_position_in_game_state):
+        five_fields = get_five_fields(formula_indexes, formula_counters, threat_formula_players, game_state, bitboard,
+                                      player, board_size)
+        if len(five_fields) > 0:
+            return five_fields[0]
+    return search_vcf(formula_indexes, formula_counters, threat_formula_players, game_state, bitboard, stop_search,
+                      vcf_nodes, computer_position_in_game_state, VCF_DEPTH, board_size)
+
+
+@njit(nogil=True, cache=True)
+def prepare_fields(formula_counters, board_size, game_state, minmax_number_of_fields_value, minmax_option_value,
+                   formulas_selection_value, search_statistics):
+    search_statistics[PREPARE_FIELDS_STATISTIC] += 1
+    main_scores = formula_counters[MAIN_FORMULAS][2]
+    four_checker_scores = formula_counters[FOUR_CHECKER_FORMULAS][2]
+    three_checker_scores = formula_counters[THREE_CHECKER_FORMULAS][2]
+    nearby_field_checker_scores = formula_counters[NEARBY_FIELD_CHECKER_FORMULAS][2]
     non_corrupted_fields = [index for index in range(1, (board_size ** 2) + 1) if
                             not game_state[(index - 1) * 2] == 1 and not game_state[((index - 1) * 2) + 1] == 1]
     if minmax_option_value == "all non corrupted fields":
         return List(non_corrupted_fields)
     if minmax_option_value == "nearby fields":
-        return check_additional_formulas(nearby_field_checker_formulas_dict, non_corrupted_fields, game_state)
+        search_statistics[ADDITIONAL_FORMULAS_STATISTIC] += 1
+        return check_additional_formulas(nearby_field_checker_scores, non_corrupted_fields)
     if minmax_option_value == "fields chosen by formulas":
         if formulas_selection_value == "all":
-            fields = check_additional_formulas(four_checker_formulas_dict, non_corrupted_fields, game_state)
-            [fields.append(field) for field in
-             check_additional_formulas(three_checker_formulas_dict, non_corrupted_fields, game_state) if
-             field not in fields]
+            search_statistics[ADDITIONAL_FORMULAS_STATISTIC] += 2
+            fields = check_additional_formulas(four_checker_scores, non_corrupted_fields)
+            [fields.append(field) for field in check_additional_formulas(three_checker_scores, non_corrupted_fields)
+             if field not in fields]
             if len(fields) < minmax_number_of_fields_value:
+                search_statistics[ADDITIONAL_FORMULAS_STATISTIC] += 1
                 nfc_fields = [field for field in
-                              check_additional_formulas(nearby_field_checker_formulas_dict, non_corrupted_fields,
-                                                        game_state) if field not in fields]
-                mfc_fields = check_main_formulas(main_formulas_dict, nfc_fields, game_state)
+                              check_additional_formulas(nearby_field_checker_scores, non_corrupted_fields) if
+                              field not in fields]
+                search_statistics[MAIN_FORMULAS_STATISTIC] += 1
+                mfc_fields = check_main_formulas(main_scores, nfc_fields)
                 number_of_missing_fields = minmax_number_of_fields_value - len(fields)
                 [fields.append(result[1]) for result in mfc_fields[:number_of_missing_fields] if
                  result[1] not in fields]
@@ -188,140 +665,49 @@ def prepare_fields(four_checker_formulas_dict, three_checker_formulas_dict, near
             else:
                 return fields[:minmax_number_of_fields_value]
         if formulas_selection_value == "artificial":
-            fields = check_additional_formulas(four_checker_formulas_dict, non_corrupted_fields, game_state)
-            [fields.append(field) for field in
-             check_additional_formulas(three_checker_formulas_dict, non_corrupted_fields, game_state) if
-             field not in fields]
+            search_statistics[ADDITIONAL_FORMULAS_STATISTIC] += 2
+            fields = check_additional_formulas(four_checker_scores, non_corrupted_fields)
+            [fields.append(field) for field in check_additional_formulas(three_checker_scores, non_corrupted_fields)
+             if field not in fields]
             if len(fields) < minmax_number_of_fields_value:
+                search_statistics[ADDITIONAL_FORMULAS_STATISTIC] += 1
                 nfc_fields = [field for field in
-                              check_additional_formulas(nearby_field_checker_formulas_dict, non_corrupted_fields,
-                                                        game_state) if field not in fields]
+                              check_additional_formulas(nearby_field_checker_scores, non_corrupted_fields) if
+                              field not in fields]
                 number_of_missing_fields = minmax_number_of_fields_value - len(fields)
                 [fields.append(field) for field in nfc_fields[:number_of_missing_fields] if field not in fields]
                 return fields
             else:
                 return fields[:minmax_number_of_fields_value]
         if formulas_selection_value == "learned":
-            mfc_fields = check_main_formulas(main_formulas_dict, non_corrupted_fields, game_state)
+            search_statistics[MAIN_FORMULAS_STATISTIC] += 1
+            mfc_fields = check_main_formulas(main_scores, non_corrupted_fields)
             fields = List([result[1] for result in mfc_fields[:minmax_number_of_fields_value] if result[1]])
             return fields
 
 
-@njit(nogil=True)
-def check_additional_formulas(additional_formulas_dict, non_corrupted_fields, game_state):
+@njit(nogil=True, cache=True)
+def check_additional_formulas(additional_scores, non_corrupted_fields):
     result = List()
     for field in non_corrupted_fields:
-        score = 0
-        for formula in additional_formulas_dict[field]:
-            formula_logic_value = True
-            for clause in formula:
-                clause_logic_value = False
-                for literal in clause:
-                    if literal < 0:
-                        if not bool(game_state[literal * -1]):
-                            clause_logic_value = True
-                            break
-                    else:
-                        if bool(game_state[literal]):
-                            clause_logic_value = True
-                            break
-                if not clause_logic_value:
-                    formula_logic_value = False
-                    break
-            if formula_logic_value:
-                score += 1
-        if score > 0:
+        if additional_scores[field - 1] > 0:
             result.append(field)
     return result
 
 
-@njit(nogil=True)
-def check_main_formulas(main_formulas_dict, non_corrupted_fields, game_state):
+@njit(nogil=True, cache=True)
+def check_main_formulas(main_scores, non_corrupted_fields):
     result = List()
     for field in non_corrupted_fields:
-        zero_formula_type_score = 0
-        for formula in main_formulas_dict[field][0]:
-            formula_logic_value = True
-            for clause in formula:
-                clause_logic_value = False
-                for literal in clause:
-                    if literal < 0:
-                        if not bool(game_state[literal * -1]):
-                            clause_logic_value = True
-                            break
-                    else:
-                        if bool(game_state[literal]):
-                            clause_logic_value = True
-                            break
-                if not clause_logic_value:
-                    formula_logic_value = False
-                    break
-            if formula_logic_value:
-                zero_formula_type_score += 1
-        one_formula_type_score = 0
-        for formula in main_formulas_dict[field][1]:
-            formula_logic_value = True
-            for clause in formula:
-                clause_logic_value = False
-                for literal in clause:
-                    if literal < 0:
-                        if not bool(game_state[literal * -1]):
-                            clause_logic_value = True
-                            break
-                    else:
-                        if bool(game_state[literal]):
-                            clause_logic_value = True
-                            break
-                if not clause_logic_value:
-                    formula_logic_value = False
-                    break
-            if formula_logic_value:
-                one_formula_type_score += 1
-        result.append((one_formula_type_score - zero_formula_type_score, field))
+        result.append((main_scores[((field - 1) * 2) + 1] - main_scores[(field - 1) * 2], field))
     result.sort(reverse=True)
     return result
 
 
-@njit(nogil=True)
-def check_evaluation_formulas(evaluation_formulas_dict, game_state, computer_position_in_game_state):
-    player_0_score = 0
-    for formula in evaluation_formulas_dict[0]:
-        formula_logic_value = True
-        for clause in formula:
-            clause_logic_value = False
-            for literal in clause:
-                if literal < 0:
-                    if not bool(game_state[literal * -1]):
-                        clause_logic_value = True
-                        break
-                else:
-                    if bool(game_state[literal]):
-                        clause_logic_value = True
-                        break
-            if not clause_logic_value:
-                formula_logic_value = False
-                break
-        if formula_logic_value:
-            player_0_score += 1
-    player_1_score = 0
-    for formula in evaluation_formulas_dict[1]:
-        formula_logic_value = True
-        for clause in formula:
-            clause_logic_value = False
-            for literal in clause:
-                if literal < 0:
-                    if not bool(game_state[literal * -1]):
-                        clause_logic_value = True
-                        break
-                else:
-                    if bool(game_state[literal]):
-                        clause_logic_value = True
-                        break
-            if not clause_logic_value:
-                formula_logic_value = False
-                break
-        if formula_logic_value:
-            player_1_score += 1
+@njit(nogil=True, cache=True)
+def check_evaluation_formulas(evaluation_scores, computer_position_in_game_state):
+    player_0_score = evaluation_scores[0]
+    player_1_score = evaluation_scores[1]
     if player_1_score > player_0_score:
         result = ((player_1_score - player_0_score) / 100) if computer_position_in_game_state == 1 \
             else ((player_1_score - player_0_score) / 100) * -1
@@ -334,74 +720,13 @@ def check_evaluation_formulas(evaluation_formulas_dict, game_state, computer_pos
         return 0
 
 
-@njit(nogil=True)
-def get_score(evaluation_formulas_dict, game_state, board_size, computer_position_in_game_state,
-              evaluation_function_option_value):
-    corrupted_fields_by_computer = []
-    corrupted_fields_by_human = []
-    human_position_in_game_state = 0 if computer_position_in_game_state == 1 else 1
-    for index, value in enumerate(game_state[computer_position_in_game_state::2]):
-        if value == 1:
-            corrupted_fields_by_computer.append(transform_index_to_coordinate(index + 1, board_size))
-    for index, value in enumerate(game_state[human_position_in_game_state::2]):
-        if value == 1:
-            corrupted_fields_by_human.append(transform_index_to_coordinate(index + 1, board_size))
-    if len(corrupted_fields_by_computer) < 5 and len(corrupted_fields_by_human) < 5:
-        if evaluation_function_option_value == "on":
-            return check_evaluation_formulas(evaluation_formulas_dict, game_state, computer_position_in_game_state)
-        else:
-            return 0
-    for index, corrupted_fields in enumerate([corrupted_fields_by_computer, corrupted_fields_by_human]):
-        for y in range(1, board_size + 1):
-            fields = [corrupted_field for corrupted_field in corrupted_fields if corrupted_field[1] == y]
-            if len(fields) < 5:
-                continue
-            else:
-                for field in fields:
-                    unwanted_fields = [(field[0] - 1, y), (field[0] + 5, y)]
-                    if check_elements_membership(unwanted_fields, fields, False):
-                        wanted_fields = [(field[0] + i, y) for i in range(1, 5)]
-                        if check_elements_membership(wanted_fields, fields, True):
-                            return 1 if index == 0 else -1
-        for x in range(1, board_size + 1):
-            fields = [field for field in corrupted_fields if field[0] == x]
-            if len(fields) < 5:
-                continue
-            else:
-                for field in fields:
-                    unwanted_fields = [(x, field[1] - 1), (x, field[1] + 5)]
-                    if check_elements_membership(unwanted_fields, fields, False):
-                        wanted_fields = [(x, field[1] + i) for i in range(1, 5)]
-                        if check_elements_membership(wanted_fields, fields, True):
-                            return 1 if index == 0 else -1
-        for field in corrupted_fields:
-            unwanted_fields = [(field[0] - 1, field[1] - 1), (field[0] + 5, field[1] + 5)]
-            if check_elements_membership(unwanted_fields, corrupted_fields, False):
-                wanted_fields = [(field[0] + i, field[1] + i) for i in range(1, 5)]
-                if check_elements_membership(wanted_fields, corrupted_fields, True):
-                    return 1 if index == 0 else -1
-        for field in corrupted_fields:
-            unwanted_fields = [(field[0] + 1, field[1] - 1), (field[0] - 5, field[1] + 5)]
-            if check_elements_membership(unwanted_fields, corrupted_fields, False):
-                wanted_fields = [(field[0] - i, field[1] + i) for i in range(1, 5)]
-                if check_elements_membership(wanted_fields, corrupted_fields, True):
-                    return 1 if index == 0 else -1
+@njit(nogil=True, cache=True)
+def get_score(formula_counters, bitboard, board_size, last_field, last_player, computer_position_in_game_state,
+              evaluation_function_option_value, search_statistics):
+    if check_five_through_field(bitboard, last_field, last_player, board_size):
+        return 1 if last_player == computer_position_in_game_state else -1
     if evaluation_function_option_value == "on":
-        return check_evaluation_formulas(evaluation_formulas_dict, game_state, computer_position_in_game_state)
+        search_statistics[EVALUATION_FORMULAS_STATISTIC] += 1
+        return check_evaluation_formulas(formula_counters[EVALUATION_FORMULAS][2], computer_position_in_game_state)
     else:
         return 0
-
-
-@njit(nogil=True)
-def check_elements_membership(iterable_to_check, target_iterable, should_be_in_target_iterable):
-    for element in iterable_to_check:
-        if should_be_in_target_iterable and element not in target_iterable:
-            return False
-        if not should_be_in_target_iterable and element in target_iterable:
-            return False
-    return True
-
-
-@njit(nogil=True)
-def transform_index_to_coordinate(index, board_size):
-    return ((index - 1) % board_size) + 1, math.ceil(index / board_size)
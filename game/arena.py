@@ -0,0 +1,104 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ai import AI
+from game_core import GameCore
+from opening_book import PSQ_FILES_PATH, read_psq_file
+
+BOARD_SIZE = 15
+ARENA_GAMES = 24
+ARENA_OPENING_PLIES = 10
+ARENA_PROCESSES = os.cpu_count() or 1
+FIRST_ENGINE_OPTIONS = ((0, "computer"), "fields chosen by formulas", "on", 5, 4, "all", 60, 1, "pvs")
+SECOND_ENGINE_OPTIONS = ((1, "computer"), "fields chosen by formulas", "on", 5, 4, "all", 60, 1, "alpha-beta")
+
+arena_ai = None
+
+
+def initialize_arena_process(board_size):
+    global arena_ai
+    arena_ai = AI(board_size, 1)
+
+
+def get_arena_openings(board_size, plies):
+    openings = set()
+    for file_path in sorted(glob.glob(str(PSQ_FILES_PATH.joinpath("*.psq")))):
+        moves = read_psq_file(file_path, board_size)
+        if moves and len(moves) > plies:
+            openings.add(tuple(moves[:plies]))
+    return sorted(openings)
+
+
+def play_arena_game(board_size, opening, players_options):
+    arena_ai.clear_transposition_tables()
+    game_core = GameCore(board_size, players_options[0], players_options[1], opening)
+    move_times = [[], []]
+    searched_nodes = [0, 0]
+    search_times = [0.0, 0.0]
+    while not game_core.game_ended:
+        player = game_core.current_position
+        start_time = time.perf_counter()
+        field = arena_ai.get_best_move(game_core.game_state, player, players_options[player],
+                                       game_core.round_times[player])
+        move_time = time.perf_counter() - start_time
+        move_times[player].append(move_time)
+        search_statistics = arena_ai.last_search_statistics
+        searched_nodes[player] += search_statistics["nodes"]
+        search_times[player] += search_statistics["wall_time"]
+        if not game_core.elapse_time(move_time):
+            game_core.make_move(field)
+    return game_core.winner, move_times, searched_nodes, search_times
+
+
+def play_arena_match(arguments):
+    board_size, game, opening, first_engine_options, second_engine_options = arguments
+    first_engine_player = game % 2
+    players_options = (first_engine_options, second_engine_options) if first_engine_player == 0 else \
+        (second_engine_options, first_engine_options)
+    winner, move_times, searched_nodes, search_times = play_arena_game(board_size, opening, players_options)
+    engines = (first_engine_player, 1 - first_engine_player)
+    return (None if winner is None else engines.index(winner), [move_times[player] for player in engines],
+            [searched_nodes[player] for player in engines], [search_times[player] for player in engines])
+
+
+def run_arena(first_engine_options=FIRST_ENGINE_OPTIONS, second_engine_options=SECOND_ENGINE_OPTIONS,
+              number_of_games=ARENA_GAMES, board_size=BOARD_SIZE, opening_plies=ARENA_OPENING_PLIES,
+              number_of_processes=ARENA_PROCESSES):
+    openings = get_arena_openings(board_size, opening_plies)
+    matches = [(board_size, game, openings[(game // 2) % len(openings)], first_engine_options, second_engine_options)
+               for game in range(number_of_games)]
+    results = {"wins": 0, "draws": 0, "losses": 0, "move_times": [[], []], "searched_nodes": [0, 0],
+               "search_times": [0.0, 0.0]}
+    with ProcessPoolExecutor(min(number_of_processes, number_of_games), initializer=initialize_arena_process,
+                             initargs=(board_size,)) as executor:
+        for winner, move_times, searched_nodes, search_times in executor.map(play_arena_match, matches):
+            if winner is None:
+                results["draws"] += 1
+            else:
+                results["wins" if winner == 0 else "losses"] += 1
+            for engine in range(2):
+                results["move_times"][engine].extend(move_times[engine])
+                results["searched_nodes"][engine] += searched_nodes[engine]
+                results["search_times"][engine] += search_times[engine]
+    return results
+
+
+def main():
+    start_time = time.perf_counter()
+    results = run_arena()
+    print(f"first engine: {FIRST_ENGINE_OPTIONS}")
+    print(f"second engine: {SECOND_ENGINE_OPTIONS}")
+    print(f"first engine W/D/L: {results['wins']}/{results['draws']}/{results['losses']}")
+    for engine in range(2):
+        move_times = results["move_times"][engine]
+        search_time = results["search_times"][engine]
+        print(f"{('first', 'second')[engine]} engine: average move latency "
+              f"{(sum(move_times) / len(move_times)) if move_times else 0:.3f}s, nodes per second "
+              f"{(results['searched_nodes'][engine] / search_time) if search_time else 0:.0f}")
+    print(f"arena time: {time.perf_counter() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
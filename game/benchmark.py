@@ -0,0 +1,190 @@
+import glob
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy
+
+from ai import AI
+from opening_book import PSQ_FILES_PATH, read_psq_file
+
+BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+BOARD_SIZE = 15
+BENCHMARK_VERSION = 1
+BENCHMARK_GAMES = 8
+BENCHMARK_OPENING_PLY = 6
+BENCHMARK_MIDDLEGAME_PLY = 16
+BENCHMARK_TACTICAL_PLIES_BEFORE_END = 3
+BENCHMARK_REPETITIONS = 3
+BENCHMARK_SEED = 2023
+BENCHMARK_NUMBER_OF_FIELDS = 5
+BENCHMARK_ROUND_TIME = 10 ** 6
+BENCHMARK_SEARCH = "pvs"
+BENCHMARK_COMBINATIONS = (("fields chosen by formulas", "all", 3), ("fields chosen by formulas", "all", 5),
+                          ("fields chosen by formulas", "artificial", 3),
+                          ("fields chosen by formulas", "artificial", 5), ("fields chosen by formulas", "learned", 3),
+                          ("fields chosen by formulas", "learned", 5), ("nearby fields", "all", 2),
+                          ("nearby fields", "all", 4), ("all non corrupted fields", "all", 2))
+BENCHMARK_SLOWDOWN_TOLERANCE = 1.25
+BENCHMARK_SLOWDOWN_MARGIN = 0.005
+BENCHMARK_BASELINE_PATH = BASE_DIR.joinpath("benchmark_baseline.json")
+BENCHMARK_LATENCY_BASELINE_PATH = BASE_DIR.joinpath("benchmark/latency_baseline.json")
+BENCHMARK_RESULTS_PATH = BASE_DIR.joinpath("benchmark/results.json")
+
+
+def get_benchmark_positions(board_size=BOARD_SIZE, number_of_games=BENCHMARK_GAMES):
+    positions = []
+    games = [(Path(file_path).stem, read_psq_file(file_path, board_size)) for file_path in
+             sorted(glob.glob(str(PSQ_FILES_PATH.joinpath("*.psq"))))]
+    for game_name, moves in [game for game in games if game[1]][:number_of_games]:
+        for position_type, ply in (("opening", BENCHMARK_OPENING_PLY), ("middlegame", BENCHMARK_MIDDLEGAME_PLY),
+                                   ("tactical", len(moves) - BENCHMARK_TACTICAL_PLIES_BEFORE_END)):
+            if BENCHMARK_OPENING_PLY <= ply < len(moves) and \
+                    all(sorted(position["moves"]) != sorted(moves[:ply]) for position in positions):
+                positions.append({"name": f"{position_type} {game_name} {ply}", "moves": moves[:ply]})
+    return positions
+
+
+def get_combination_name(combination):
+    minmax_option_value, formulas_selection_value, depth = combination
+    if minmax_option_value == "fields chosen by formulas":
+        return f"{minmax_option_value} {formulas_selection_value} depth {depth}"
+    return f"{minmax_option_value} depth {depth}"
+
+
+def create_player_options_tuple(combination):
+    minmax_option_value, formulas_selection_value, depth = combination
+    return ((0, "computer"), minmax_option_value, "on", BENCHMARK_NUMBER_OF_FIELDS, depth, formulas_selection_value,
+            BENCHMARK_ROUND_TIME, 0, BENCHMARK_SEARCH)
+
+
+def create_game_state(moves, board_size):
+    game_state = [0 for _ in range((board_size ** 2) * 2)]
+    for ply, field in enumerate(moves):
+        game_state[((field - 1) * 2) + (ply % 2)] = 1
+    return game_state
+
+
+def run_benchmark(ai, positions, combinations=BENCHMARK_COMBINATIONS, repetitions=BENCHMARK_REPETITIONS,
+                  board_size=BOARD_SIZE):
+    results = {}
+    for position in positions:
+        ai.clear_transposition_tables()
+        ai.get_best_move(create_game_state(position["moves"], board_size), len(position["moves"]) % 2,
+                         create_player_options_tuple(combinations[0]))
+    for combination in combinations:
+        player_options_tuple = create_player_options_tuple(combination)
+        fields, nodes, latencies = [], [], []
+        for position in positions:
+            game_state = create_game_state(position["moves"], board_size)
+            position_latencies = []
+            for _ in range(repetitions):
+                ai.clear_transposition_tables()
+                random.seed(BENCHMARK_SEED)
+                start_time = time.perf_counter()
+                field = ai.get_best_move(game_state, len(position["moves"]) % 2, player_options_tuple)
+                position_latencies.append(time.perf_counter() - start_time)
+            fields.append(int(field))
+            nodes.append(ai.last_search_statistics["nodes"])
+            latencies.append(min(position_latencies))
+        results[get_combination_name(combination)] = {
+            "fields": fields, "nodes": nodes, "latencies": latencies,
+            "latency_percentiles": {f"p{percentile}": float(numpy.percentile(latencies, percentile)) for percentile in
+                                    (50, 90, 99)},
+            "total_latency": sum(latencies), "total_nodes": sum(nodes)}
+    return {"version": BENCHMARK_VERSION, "positions": positions, "results": results}
+
+
+def get_search_baseline(benchmark):
+    return {"version": benchmark["version"], "positions": benchmark["positions"],
+            "results": {name: {"fields": result["fields"], "nodes": result["nodes"]} for name, result in
+                        benchmark["results"].items()}}
+
+
+def compare_search_results(baseline, benchmark):
+    differences = []
+    if baseline["version"] != benchmark["version"] or baseline["positions"] != benchmark["positions"]:
+        return ["benchmark positions differ from the baseline"]
+    for name, result in benchmark["results"].items():
+        if name not in baseline["results"]:
+            continue
+        baseline_result = baseline["results"][name]
+        for position, baseline_field, field, baseline_nodes, nodes in zip(
+                benchmark["positions"], baseline_result["fields"], result["fields"], baseline_result["nodes"],
+                result["nodes"]):
+            if baseline_field != field:
+                differences.append(f"{name}, {position['name']}: field {baseline_field} -> {field}")
+            elif baseline_nodes != nodes:
+                differences.append(f"{name}, {position['name']}: nodes {baseline_nodes} -> {nodes}")
+    return differences
+
+
+def compare_latencies(baseline, benchmark, slowdown_tolerance=BENCHMARK_SLOWDOWN_TOLERANCE,
+                      slowdown_margin=BENCHMARK_SLOWDOWN_MARGIN):
+    differences = []
+    if baseline["version"] != benchmark["version"] or baseline["positions"] != benchmark["positions"]:
+        return ["benchmark positions differ from the latency baseline"]
+    for name, result in benchmark["results"].items():
+        if name not in baseline["results"]:
+            continue
+        baseline_result = baseline["results"][name]
+        for latency_name, baseline_latency, latency in (
+                ("p50 latency", baseline_result["latency_percentiles"]["p50"], result["latency_percentiles"]["p50"]),
+                ("total latency", baseline_result["total_latency"], result["total_latency"])):
+            if latency > max(baseline_latency * slowdown_tolerance, baseline_latency + slowdown_margin):
+                differences.append(f"{name}: {latency_name} {baseline_latency:.3f}s -> {latency:.3f}s")
+    return differences
+
+
+def save_benchmark(benchmark, benchmark_path):
+    os.makedirs(benchmark_path.parent, exist_ok=True)
+    with open(benchmark_path, "w") as file:
+        json.dump(benchmark, file, indent=2)
+
+
+def load_benchmark(benchmark_path):
+    try:
+        with open(benchmark_path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    ai = AI(BOARD_SIZE, 1, False)
+    benchmark = run_benchmark(ai, get_benchmark_positions())
+    for name, result in benchmark["results"].items():
+        percentiles = result["latency_percentiles"]
+        print(f"{name}: p50 {percentiles['p50']:.3f}s, p90 {percentiles['p90']:.3f}s, p99 {percentiles['p99']:.3f}s, "
+              f"nodes {result['total_nodes']}, nodes per second "
+              f"{result['total_nodes'] / result['total_latency']:.0f}")
+    save_benchmark(benchmark, BENCHMARK_RESULTS_PATH)
+    if "--save-baseline" in sys.argv:
+        save_benchmark(get_search_baseline(benchmark), BENCHMARK_BASELINE_PATH)
+        save_benchmark(benchmark, BENCHMARK_LATENCY_BASELINE_PATH)
+        print(f"baseline saved to {BENCHMARK_BASELINE_PATH} and {BENCHMARK_LATENCY_BASELINE_PATH}")
+        return 0
+    baseline = load_benchmark(BENCHMARK_BASELINE_PATH)
+    if baseline is None:
+        print(f"warning: no baseline in {BENCHMARK_BASELINE_PATH}, save one with --save-baseline")
+        return 1
+    differences = compare_search_results(baseline, benchmark)
+    latency_baseline = load_benchmark(BENCHMARK_LATENCY_BASELINE_PATH)
+    if latency_baseline is None:
+        save_benchmark(benchmark, BENCHMARK_LATENCY_BASELINE_PATH)
+        print(f"latency baseline saved to {BENCHMARK_LATENCY_BASELINE_PATH}")
+        latency_differences = []
+    else:
+        latency_differences = compare_latencies(latency_baseline, benchmark)
+    for difference in differences + latency_differences:
+        print(difference)
+    print(f"{len(differences)} search differences and {len(latency_differences)} latency differences from the "
+          f"baseline")
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
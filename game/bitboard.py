@@ -0,0 +1,91 @@
+from numba import njit
+from numpy import arange, int64, uint64, zeros
+
+WORD_SIZE = 64
+DIRECTIONS = ((1, 0), (0, 1), (1, 1), (-1, 1))
+LINE_LENGTH = 5
+
+
+def create_bitboard(board_size):
+    number_of_bits = board_size * (board_size + 1)
+    return zeros((2, (number_of_bits + WORD_SIZE - 1) // WORD_SIZE), dtype=uint64)
+
+
+@njit(nogil=True, cache=True)
+def get_bit_position(field, board_size):
+    return (((field - 1) // board_size) * (board_size + 1)) + ((field - 1) % board_size)
+
+
+@njit(nogil=True, cache=True)
+def fill_bitboard(bitboard, game_state, board_size):
+    bitboard[:] = 0
+    for column in range(len(game_state)):
+        if game_state[column] == 1:
+            make_move(bitboard, (column // 2) + 1, column % 2, board_size)
+
+
+@njit(nogil=True, cache=True)
+def make_move(bitboard, field, player, board_size):
+    position = get_bit_position(field, board_size)
+    bitboard[player, position // WORD_SIZE] |= uint64(1) << uint64(position % WORD_SIZE)
+
+
+@njit(nogil=True, cache=True)
+def unmake_move(bitboard, field, player, board_size):
+    position = get_bit_position(field, board_size)
+    bitboard[player, position // WORD_SIZE] &= ~(uint64(1) << uint64(position % WORD_SIZE))
+
+
+@njit(nogil=True, cache=True)
+def check_stone(bitboard, field, player, board_size):
+    position = get_bit_position(field, board_size)
+    return (bitboard[player, position // WORD_SIZE] >> uint64(position % WORD_SIZE)) & uint64(1) == uint64(1)
+
+
+@njit(nogil=True, cache=True)
+def count_bits(word):
+    word = word - ((word >> uint64(1)) & uint64(0x5555555555555555))
+    word = (word & uint64(0x3333333333333333)) + ((word >> uint64(2)) & uint64(0x3333333333333333))
+    word = (word + (word >> uint64(4))) & uint64(0x0F0F0F0F0F0F0F0F)
+    return (word * uint64(0x0101010101010101)) >> uint64(56)
+
+
+@njit(nogil=True, cache=True)
+def count_stones(bitboard):
+    number_of_stones = 0
+    for player in range(2):
+        for word in bitboard[player]:
+            number_of_stones += count_bits(word)
+    return number_of_stones
+
+
+@njit(nogil=True, cache=True)
+def count_line_stones(bitboard, field, player, board_size, dx, dy):
+    x = ((field - 1) % board_size) + dx
+    y = ((field - 1) // board_size) + dy
+    number_of_stones = 0
+    while 0 <= x < board_size and 0 <= y < board_size and check_stone(bitboard, (y * board_size) + x + 1, player,
+                                                                      board_size):
+        number_of_stones += 1
+        x += dx
+        y += dy
+    return number_of_stones
+
+
+@njit(nogil=True, cache=True)
+def check_five_through_field(bitboard, field, player, board_size):
+    for dx, dy in DIRECTIONS:
+        if (count_line_stones(bitboard, field, player, board_size, -dx, -dy) + 1 +
+                count_line_stones(bitboard, field, player, board_size, dx, dy)) == LINE_LENGTH:
+            return True
+    return False
+
+
+@njit(nogil=True, cache=True)
+def get_five_through_field(bitboard, field, player, board_size):
+    for dx, dy in DIRECTIONS:
+        backward_stones = count_line_stones(bitboard, field, player, board_size, -dx, -dy)
+        if backward_stones + 1 + count_line_stones(bitboard, field, player, board_size, dx, dy) == LINE_LENGTH:
+            step = (dy * board_size) + dx
+            return arange(LINE_LENGTH) * step + (field - (backward_stones * step))
+    return zeros(0, dtype=int64)
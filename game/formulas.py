@@ -0,0 +1,307 @@
+import glob
+import hashlib
+import os
+from pathlib import Path
+
+import numpy
+from numba import njit
+from numpy import (add, arange, array, atleast_2d, bincount, cumsum, diff, full, int8, int16, int32, logical_and,
+                   logical_or, repeat, where, zeros)
+
+BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+BOARD_SIZE = 15
+FORMULAS_CACHE_VERSION = 1
+FORMULAS_CACHE_PATH = BASE_DIR.joinpath("cnf/formulas.npz")
+FORMULA_FAMILIES = ("main", "evaluation", "4_checker", "3_checker", "nearby_field_checker")
+FORMULA_FAMILY_ARRAYS = ("literals", "clause_offsets", "formula_offsets", "group_offsets")
+BATCH_SIZE = 16
+
+
+def read_cnf_file(file_path):
+    with open(file_path, "r") as file:
+        all_data = [line.strip() for line in file if not line.startswith('c')]
+    number_of_clauses = int(all_data[0].split()[2])
+    raw_formulas = [all_data[i:i + number_of_clauses] for i in range(1, len(all_data), number_of_clauses)]
+    return [[[int(literal) for literal in raw_clause.split()] for raw_clause in raw_formula] for raw_formula in
+            raw_formulas]
+
+
+def create_formula_family(groups):
+    literals = []
+    clause_offsets = [0]
+    formula_offsets = [0]
+    group_offsets = [0]
+    for formulas in groups:
+        for formula in formulas:
+            for clause in formula:
+                literals += clause
+                clause_offsets.append(len(literals))
+            formula_offsets.append(len(clause_offsets) - 1)
+        group_offsets.append(len(formula_offsets) - 1)
+    return (array(literals, dtype=int16), array(clause_offsets, dtype=int32), array(formula_offsets, dtype=int32),
+            array(group_offsets, dtype=int32))
+
+
+def get_canonical_fields(board_size):
+    center = (board_size // 2) + (board_size % 2)
+    return [(board_size * i) - (board_size - j) for i in range(1, center + 1) for j in range(1, i + 1)]
+
+
+def get_symmetry_classifiers(x, y, board_size):
+    board_center = board_size // 2
+    oddity_bonus = 0
+    if not board_size % 2 == 0:
+        oddity_bonus = 1
+        if y == board_center + oddity_bonus:
+            return ["t"] if x <= board_center + oddity_bonus else ["v"]
+        if x == board_center + oddity_bonus:
+            if y < board_center + oddity_bonus:
+                return ["d1"]
+            elif y > board_center + oddity_bonus:
+                return ["d2"]
+    if x <= board_center and y <= board_center:
+        return ["t"] if y >= x else ["d1"]
+    if x > board_center + oddity_bonus and y <= board_center:
+        return ["v"] if y > board_size - x else ["v", "d1"]
+    if x > board_center + oddity_bonus and y > board_center + oddity_bonus:
+        return ["d2"] if y >= x else ["h", "v"]
+    if x <= board_center and y > board_center + oddity_bonus:
+        return ["h", "d1"] if y > board_size - x + 1 else ["h"]
+
+
+def perform_symmetry_on_fields(fields, classifier, board_size):
+    x, y = ((fields - 1) % board_size) + 1, ((fields - 1) // board_size) + 1
+    if classifier == "v":
+        x = board_size - x + 1
+    elif classifier == "h":
+        y = board_size - y + 1
+    elif classifier == "d1":
+        x, y = y, x
+    elif classifier == "d2":
+        x, y = board_size - y + 1, board_size - x + 1
+    return (board_size * y) - (board_size - x)
+
+
+def create_main_formulas_symmetries(board_size):
+    canonical_fields = zeros((board_size ** 2) + 1, dtype=int32)
+    column_permutations = zeros(((board_size ** 2) + 1, (board_size ** 2) * 2), dtype=int32)
+    columns = arange((board_size ** 2) * 2)
+    for field in range(1, (board_size ** 2) + 1):
+        classifiers = get_symmetry_classifiers(((field - 1) % board_size) + 1, ((field - 1) // board_size) + 1,
+                                               board_size)
+        canonical_field = array(field)
+        for classifier in classifiers:
+            canonical_field = perform_symmetry_on_fields(canonical_field, classifier, board_size)
+        canonical_fields[field] = canonical_field
+        fields = (columns // 2) + 1
+        for classifier in reversed(classifiers):
+            fields = perform_symmetry_on_fields(fields, classifier, board_size)
+        column_permutations[field] = ((fields - 1) * 2) + (columns % 2)
+    return canonical_fields, column_permutations
+
+
+def read_main_cnf_file(file_path):
+    with open(file_path, "r") as file:
+        all_data = [line.split() for line in file if not line.startswith('c')]
+    number_of_clauses = int(all_data[0][2])
+    raw_clauses = all_data[1:]
+    raw_literals = [raw_literal for raw_clause in raw_clauses for raw_literal in raw_clause]
+    return (array([int(raw_literal.lstrip('-')) for raw_literal in raw_literals], dtype=int32),
+            array([raw_literal.startswith('-') for raw_literal in raw_literals]),
+            array([len(raw_clause) for raw_clause in raw_clauses], dtype=int32), number_of_clauses)
+
+
+def load_main_formulas(board_size):
+    canonical_fields, column_permutations = create_main_formulas_symmetries(board_size)
+    canonical_formulas = {(field, formula_type): read_main_cnf_file(BASE_DIR.joinpath(
+        f"cnf/main/{field}_{formula_type}.cnf")) for field in get_canonical_fields(board_size) for formula_type in
+        range(2)}
+    literals, clause_lengths, formula_lengths, group_lengths = [], [], [], []
+    for field in range(1, (board_size ** 2) + 1):
+        for formula_type in range(2):
+            columns, negations, lengths, number_of_clauses = canonical_formulas[(canonical_fields[field],
+                                                                                 formula_type)]
+            columns = column_permutations[field][columns]
+            literals.append(where(negations, -columns, columns))
+            clause_lengths.append(lengths)
+            formula_lengths.append(full(len(lengths) // number_of_clauses, number_of_clauses, dtype=int32))
+            group_lengths.append(len(lengths) // number_of_clauses)
+    clause_offsets = zeros(sum(len(lengths) for lengths in clause_lengths) + 1, dtype=int32)
+    clause_offsets[1:] = cumsum(numpy.concatenate(clause_lengths))
+    formula_offsets = zeros(sum(len(lengths) for lengths in formula_lengths) + 1, dtype=int32)
+    formula_offsets[1:] = cumsum(numpy.concatenate(formula_lengths))
+    group_offsets = zeros(len(group_lengths) + 1, dtype=int32)
+    group_offsets[1:] = cumsum(group_lengths)
+    return numpy.concatenate(literals).astype(int16), clause_offsets, formula_offsets, group_offsets
+
+
+def load_evaluation_formulas():
+    return create_formula_family(
+        [read_cnf_file(BASE_DIR.joinpath(f"cnf/evaluation/evaluation_player_{player}.cnf")) for player in range(2)])
+
+
+def load_additional_formulas(board_size, formula_type):
+    groups = []
+    for field in range(1, (board_size ** 2) + 1):
+        formulas = []
+        for file_path in sorted(glob.glob(str(BASE_DIR.joinpath(f"cnf/additional/{field}_{formula_type}*.cnf")))):
+            formulas += read_cnf_file(file_path)
+        groups.append(formulas)
+    return create_formula_family(groups)
+
+
+def load_formulas_from_cnf_files(board_size):
+    formulas = {"main": load_main_formulas(board_size), "evaluation": load_evaluation_formulas()}
+    for formula_type in FORMULA_FAMILIES[2:]:
+        formulas[formula_type] = load_additional_formulas(board_size, formula_type)
+    return formulas
+
+
+def get_cnf_files_fingerprint():
+    fingerprint = hashlib.sha256()
+    for file_path in sorted(glob.glob(str(BASE_DIR.joinpath("cnf/*/*.cnf")))):
+        file_stat = os.stat(file_path)
+        fingerprint.update(f"{os.path.relpath(file_path, BASE_DIR)}:{file_stat.st_size}:"
+                           f"{file_stat.st_mtime_ns};".encode())
+    return fingerprint.hexdigest()
+
+
+def save_formulas_cache(formulas, board_size, fingerprint, cache_path=FORMULAS_CACHE_PATH):
+    arrays = {"version": array(FORMULAS_CACHE_VERSION), "board_size": array(board_size),
+              "fingerprint": array(fingerprint)}
+    for family in FORMULA_FAMILIES:
+        for name, family_array in zip(FORMULA_FAMILY_ARRAYS, formulas[family]):
+            arrays[f"{family}/{name}"] = family_array
+    tmp_cache_path = Path(f"{cache_path}.tmp")
+    with open(tmp_cache_path, "wb") as cache_file:
+        numpy.savez(cache_file, **arrays)
+    os.replace(tmp_cache_path, cache_path)
+
+
+def load_formulas_cache(board_size, fingerprint, cache_path=FORMULAS_CACHE_PATH):
+    try:
+        with numpy.load(cache_path) as data:
+            if (int(data["version"]) != FORMULAS_CACHE_VERSION or int(data["board_size"]) != board_size or
+                    str(data["fingerprint"]) != fingerprint):
+                return None
+            return {family: tuple(data[f"{family}/{name}"] for name in FORMULA_FAMILY_ARRAYS) for family in
+                    FORMULA_FAMILIES}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def build_formulas_cache(board_size, cache_path=FORMULAS_CACHE_PATH):
+    fingerprint = get_cnf_files_fingerprint()
+    formulas = load_formulas_from_cnf_files(board_size)
+    save_formulas_cache(formulas, board_size, fingerprint, cache_path)
+    return formulas
+
+
+def load_formulas(board_size, cache_path=FORMULAS_CACHE_PATH):
+    fingerprint = get_cnf_files_fingerprint()
+    formulas = load_formulas_cache(board_size, fingerprint, cache_path)
+    if formulas is None:
+        formulas = load_formulas_from_cnf_files(board_size)
+        try:
+            save_formulas_cache(formulas, board_size, fingerprint, cache_path)
+        except OSError:
+            pass
+    return formulas
+
+
+def create_formula_index(formulas, number_of_columns):
+    literals, clause_offsets, formula_offsets, group_offsets = formulas
+    columns = abs(literals.astype(int32))
+    order = columns.argsort(kind="stable")
+    column_offsets = zeros(number_of_columns + 1, dtype=int32)
+    column_offsets[1:] = cumsum(bincount(columns, minlength=number_of_columns))
+    literal_clauses = repeat(arange(len(clause_offsets) - 1, dtype=int32), diff(clause_offsets))
+    clause_formulas = repeat(arange(len(formula_offsets) - 1, dtype=int32), diff(formula_offsets))
+    formula_groups = repeat(arange(len(group_offsets) - 1, dtype=int32), diff(group_offsets))
+    return (column_offsets, literal_clauses[order], where(literals[order] < 0, -1, 1).astype(int8), clause_formulas,
+            formula_groups)
+
+
+def create_formula_counters(formulas):
+    return (zeros(len(formulas[1]) - 1, dtype=int16), zeros(len(formulas[2]) - 1, dtype=int16),
+            zeros(len(formulas[3]) - 1, dtype=int32))
+
+
+@njit(nogil=True, cache=True)
+def initialize_formula_counters(formulas, formula_counters, game_state):
+    literals, clause_offsets, formula_offsets, group_offsets = formulas
+    clause_counters, formula_counters, group_counters = formula_counters
+    for clause in range(len(clause_offsets) - 1):
+        satisfied_literals = 0
+        for literal in literals[clause_offsets[clause]:clause_offsets[clause + 1]]:
+            if literal < 0:
+                if game_state[-literal] == 0:
+                    satisfied_literals += 1
+            else:
+                if game_state[literal] != 0:
+                    satisfied_literals += 1
+        clause_counters[clause] = satisfied_literals
+    for group in range(len(group_offsets) - 1):
+        group_counters[group] = 0
+        for formula in range(group_offsets[group], group_offsets[group + 1]):
+            unsatisfied_clauses = 0
+            for clause in range(formula_offsets[formula], formula_offsets[formula + 1]):
+                if clause_counters[clause] == 0:
+                    unsatisfied_clauses += 1
+            formula_counters[formula] = unsatisfied_clauses
+            if unsatisfied_clauses == 0:
+                group_counters[group] += 1
+
+
+@njit(nogil=True, cache=True)
+def update_formula_counters(formula_index, formula_counters, column, value):
+    column_offsets, column_clauses, column_signs, clause_formulas, formula_groups = formula_index
+    clause_counters, formula_counters, group_counters = formula_counters
+    for i in range(column_offsets[column], column_offsets[column + 1]):
+        clause = column_clauses[i]
+        satisfied_literals = clause_counters[clause] + (column_signs[i] * value)
+        if satisfied_literals == 1 and clause_counters[clause] == 0:
+            formula = clause_formulas[clause]
+            formula_counters[formula] -= 1
+            if formula_counters[formula] == 0:
+                group_counters[formula_groups[formula]] += 1
+        elif satisfied_literals == 0:
+            formula = clause_formulas[clause]
+            if formula_counters[formula] == 0:
+                group_counters[formula_groups[formula]] -= 1
+            formula_counters[formula] += 1
+        clause_counters[clause] = satisfied_literals
+    return column_offsets[column + 1] - column_offsets[column]
+
+
+def create_batch_formula_family(formulas):
+    literals, clause_offsets, formula_offsets, group_offsets = formulas
+    return abs(literals.astype(int32)), literals < 0, clause_offsets, formula_offsets, group_offsets
+
+
+def reduce_segments(ufunc, values, offsets, empty_value):
+    result = full((values.shape[0], len(offsets) - 1), empty_value, dtype=values.dtype)
+    non_empty_segments = offsets[:-1] < offsets[1:]
+    if non_empty_segments.any():
+        result[:, non_empty_segments] = ufunc.reduceat(values, offsets[:-1][non_empty_segments], axis=1)
+    return result
+
+
+def count_satisfied_formulas_batch(batch_formulas, game_states):
+    columns, negations, clause_offsets, formula_offsets, group_offsets = batch_formulas
+    game_states = atleast_2d(game_states) != 0
+    group_scores = zeros((len(game_states), len(group_offsets) - 1), dtype=int32)
+    for start in range(0, len(game_states), BATCH_SIZE):
+        literal_values = game_states[start:start + BATCH_SIZE, columns] != negations
+        clause_values = reduce_segments(logical_or, literal_values, clause_offsets, False)
+        formula_values = reduce_segments(logical_and, clause_values, formula_offsets, True)
+        group_scores[start:start + BATCH_SIZE] = reduce_segments(add, formula_values.astype(int32), group_offsets, 0)
+    return group_scores
+
+
+def main():
+    build_formulas_cache(BOARD_SIZE)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,25 @@
-import math
 import os
+import queue
 import sys
 import threading
+import traceback
 import uuid
+from functools import lru_cache
 from pathlib import Path
 
 import pygame
 
-from ai import AI
+from ai import AI, create_stop_search
+from bitboard import create_bitboard, get_five_through_field
+from game_core import GameCore
 
 SCREEN_WIDTH = 500
 SCREEN_HEIGHT = 690
 FPS = 30
+MENU_EVENT_TIMEOUT = 250
+GAME_EVENT_TIMEOUT = 1000
+TEXT_CACHE_SIZE = 256
+PONDERING = True
 
 BLUE_WHALE_COLOR = (30, 47, 74)
 BLUE_WHALE_DARK_COLOR = (23, 35, 54)
@@ -23,7 +31,26 @@ SALEM_COLOR = (23, 128, 63)
 
 BASE_PATH = Path(os.path.dirname(os.path.abspath(__file__)))
 DEFAULT_FONT = BASE_PATH.joinpath("assets/font/yoster.ttf")
-ICON = pygame.image.load(BASE_PATH.joinpath("assets/icon.png"))
+ICON_PATH = BASE_PATH.joinpath("assets/icon.png")
+AI_MOVE_EVENT = pygame.USEREVENT + 2
+AI_LOADED_EVENT = pygame.USEREVENT + 3
+
+
+@lru_cache(maxsize=None)
+def get_font(font_size):
+    return pygame.font.Font(DEFAULT_FONT, font_size)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text, font_size, color):
+    return get_font(font_size).render(text, True, color)
+
+
+def wait_for_events(timeout):
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
 
 
 class Button:
@@ -33,13 +60,13 @@ class Button:
         self._width = width
         self._height = height
         self._text_input = text_input
-        self._font = pygame.font.Font(DEFAULT_FONT, font_size)
+        self._font_size = font_size
         self._background = pygame.Rect(self._center_x - (self._width // 2) + 1,
                                        self._center_y - (self._height // 2) + 1, self._width - 2, self._height - 2)
         self._border = pygame.Rect(self._center_x - (self._width // 2), self._center_y - (self._height // 2),
                                    self._width, self._height)
         self._border_width = 2
-        self._text = self._font.render(self._text_input, True, SHIP_COVE_COLOR)
+        self._text = render_text(self._text_input, self._font_size, SHIP_COVE_COLOR)
         self._text_rect = self._text.get_rect(center=(self._center_x, self._center_y))
         self.value = value
 
@@ -55,10 +82,10 @@ class Button:
 
     def change_color(self, x, y):
         if x in range(self._border.left, self._border.right) and y in range(self._border.top, self._border.bottom):
-            self._text = self._font.render(self._text_input, True, WHITE_SMOKE_COLOR)
+            self._text = render_text(self._text_input, self._font_size, WHITE_SMOKE_COLOR)
             self._border_width = 0
         else:
-            self._text = self._font.render(self._text_input, True, SHIP_COVE_COLOR)
+            self._text = render_text(self._text_input, self._font_size, SHIP_COVE_COLOR)
             self._border_width = 2
 
 
@@ -72,7 +99,7 @@ class ToggleButton(Button):
 
     def change_color(self, x, y):
         if self.selected:
-            self._text = self._font.render(self._text_input, True, WHITE_SMOKE_COLOR)
+            self._text = render_text(self._text_input, self._font_size, WHITE_SMOKE_COLOR)
             self._border_width = 0
         else:
             super().change_color(x, y)
@@ -94,8 +121,7 @@ class NaturalNumberInput:
     def handle(self, screen, events):
         mouse_coord = pygame.mouse.get_pos()
         if self._active:
-            input_numbers_text = pygame.font.Font(DEFAULT_FONT, self._font_size).render(self.value, True,
-                                                                                        WHITE_SMOKE_COLOR)
+            input_numbers_text = render_text(self.value, self._font_size, WHITE_SMOKE_COLOR)
             input_numbers_rect = input_numbers_text.get_rect(topleft=(self._left, self._top))
             background_rect = pygame.Rect(input_numbers_rect.left - 3, input_numbers_rect.top - 3,
                                           input_numbers_rect.width + 7, input_numbers_rect.height + 7)
@@ -109,8 +135,7 @@ class NaturalNumberInput:
                                  (background_rect.right - 3, background_rect.bottom - 3), 1)
             screen.blit(input_numbers_text, input_numbers_rect)
         else:
-            input_numbers_text = pygame.font.Font(DEFAULT_FONT, self._font_size).render(self.value, True,
-                                                                                        SHIP_COVE_COLOR)
+            input_numbers_text = render_text(self.value, self._font_size, SHIP_COVE_COLOR)
             input_numbers_rect = input_numbers_text.get_rect(topleft=(self._left, self._top))
             background_rect = pygame.Rect(input_numbers_rect.left - 3, input_numbers_rect.top - 3,
                                           input_numbers_rect.width + 7, input_numbers_rect.height + 7)
@@ -118,8 +143,7 @@ class NaturalNumberInput:
             if (mouse_coord[0] in range(background_rect.left, background_rect.right) and
                     mouse_coord[1] in range(background_rect.top, background_rect.bottom)):
                 pygame.draw.rect(screen, SHIP_COVE_COLOR, background_rect)
-                input_numbers_text = pygame.font.Font(DEFAULT_FONT, self._font_size).render(self.value, True,
-                                                                                            WHITE_SMOKE_COLOR)
+                input_numbers_text = render_text(self.value, self._font_size, WHITE_SMOKE_COLOR)
             else:
                 pygame.draw.rect(screen, SHIP_COVE_COLOR, background_rect, 2)
             screen.blit(input_numbers_text, input_numbers_rect)
@@ -179,6 +203,10 @@ class PlayerOptions:
                                                                   "artificial", 13, False, False, "artificial")
         self._formulas_selection_learned_button = ToggleButton(self._left + 193, self._top + 180, 70, 20, "learned", 13,
                                                                False, False, "learned")
+        self._minmax_search_alpha_beta_button = ToggleButton(self._left + 367, self._top + 180, 90, 20, "alpha-beta",
+                                                             13, False, False, "alpha-beta")
+        self._minmax_search_pvs_button = ToggleButton(self._left + 434, self._top + 180, 36, 20, "pvs", 13, False, True,
+                                                      "pvs")
         self._round_time_human_input = NaturalNumberInput(self._left + 152, self._top + 27, 15, 4, "300")
         self._increment_time_human_input = NaturalNumberInput(self._left + 143, self._top + 57, 15, 4, "5")
         self._round_time_computer_input = NaturalNumberInput(self._left + 396, self._top + 107, 15, 4, "300")
@@ -199,10 +227,10 @@ class PlayerOptions:
     def handle(self, screen, events):
         option_border = pygame.Rect(self._left, self._top, SCREEN_WIDTH - 40, 200)
         pygame.draw.rect(screen, SHIP_COVE_COLOR, option_border, 2)
-        player_sign_text = pygame.font.Font(DEFAULT_FONT, 25).render("X" if self._player_id == 0 else "0", True,
-                                                                     MEDIUM_CARMINE_COLOR if self._player_id == 0 else SALEM_COLOR)
+        player_sign_text = render_text("X" if self._player_id == 0 else "0", 25,
+                                       MEDIUM_CARMINE_COLOR if self._player_id == 0 else SALEM_COLOR)
         player_sign_rect = player_sign_text.get_rect(left=35, centery=option_border.y)
-        options_title_text = pygame.font.Font(DEFAULT_FONT, 15).render("player options", True, SHIP_COVE_COLOR)
+        options_title_text = render_text("player options", 15, SHIP_COVE_COLOR)
         options_title_rect = options_title_text.get_rect(left=60, centery=option_border.y)
         title_rect = pygame.Rect(player_sign_rect.left - 4, player_sign_rect.top - 2,
                                  (options_title_rect.right - player_sign_rect.left) + 10,
@@ -213,11 +241,11 @@ class PlayerOptions:
         screen.blit(player_sign_text, player_sign_rect)
         self._update_toggle_buttons_group([self._human_toggle_button, self._computer_toggle_button], screen, events)
         if self._human_toggle_button.selected:
-            round_time_text = pygame.font.Font(DEFAULT_FONT, 13).render("round time in sec:", True, SHIP_COVE_COLOR)
+            round_time_text = render_text("round time in sec:", 13, SHIP_COVE_COLOR)
             round_time_rect = round_time_text.get_rect(topleft=(option_border.left + 15, option_border.top + 30))
             screen.blit(round_time_text, round_time_rect)
             self._round_time_human_input.handle(screen, events)
-            increment_time_text = pygame.font.Font(DEFAULT_FONT, 13).render("incr. time in sec:", True, SHIP_COVE_COLOR)
+            increment_time_text = render_text("incr. time in sec:", 13, SHIP_COVE_COLOR)
             increment_time_rect = increment_time_text.get_rect(
                 topleft=(option_border.left + 15, option_border.top + 60))
             screen.blit(increment_time_text, increment_time_rect)
@@ -225,8 +253,7 @@ class PlayerOptions:
         if self._computer_toggle_button.selected:
             pygame.draw.line(screen, SHIP_COVE_COLOR, (option_border.centerx + 15, option_border.top),
                              (option_border.centerx + 15, option_border.bottom - 1), 2)
-            minmax_message_text = pygame.font.Font(DEFAULT_FONT, 13).render("minmax fields selection:", True,
-                                                                            SHIP_COVE_COLOR)
+            minmax_message_text = render_text("minmax fields selection:", 13, SHIP_COVE_COLOR)
             minmax_message_rect = minmax_message_text.get_rect(
                 topleft=(option_border.left + 15, option_border.top + 25))
             screen.blit(minmax_message_text, minmax_message_rect)
@@ -234,14 +261,12 @@ class PlayerOptions:
                 [self._minmax_first_option_button, self._minmax_second_option_button, self._minmax_third_option_button],
                 screen, events)
             if self._minmax_first_option_button.selected:
-                minmax_fields_number_text = pygame.font.Font(DEFAULT_FONT, 13).render("number of chosen fields:", True,
-                                                                                      SHIP_COVE_COLOR)
+                minmax_fields_number_text = render_text("number of chosen fields:", 13, SHIP_COVE_COLOR)
                 minmax_fields_number_rect = minmax_fields_number_text.get_rect(
                     topleft=(option_border.left + 15, option_border.top + 125))
                 screen.blit(minmax_fields_number_text, minmax_fields_number_rect)
                 self._minmax_number_of_fields_input.handle(screen, events)
-                formulas_selection_text = pygame.font.Font(DEFAULT_FONT, 13).render("formulas selection:", True,
-                                                                                    SHIP_COVE_COLOR)
+                formulas_selection_text = render_text("formulas selection:", 13, SHIP_COVE_COLOR)
                 formulas_selection_rect = formulas_selection_text.get_rect(
                     topleft=(option_border.left + 15, option_border.top + 150))
                 screen.blit(formulas_selection_text, formulas_selection_rect)
@@ -251,22 +276,27 @@ class PlayerOptions:
             self._minmax_depth_input.handle(screen, events)
             self._round_time_computer_input.handle(screen, events)
             self._increment_time_computer_input.handle(screen, events)
-            evaluation_function_text = pygame.font.Font(DEFAULT_FONT, 13).render("evaluation function:", True,
-                                                                                 SHIP_COVE_COLOR)
+            evaluation_function_text = render_text("evaluation function:", 13, SHIP_COVE_COLOR)
             evaluation_function_rect = evaluation_function_text.get_rect(left=option_border.centerx + 30,
                                                                          top=option_border.top + 25)
             screen.blit(evaluation_function_text, evaluation_function_rect)
             self._update_toggle_buttons_group(
                 [self._evaluation_function_on_button, self._evaluation_function_off_button], screen, events)
-            minmax_depth_text = pygame.font.Font(DEFAULT_FONT, 13).render("minmax depth:", True, SHIP_COVE_COLOR)
+            minmax_depth_text = render_text("minmax depth:", 13, SHIP_COVE_COLOR)
             minmax_depth_rect = minmax_depth_text.get_rect(left=option_border.centerx + 30, top=option_border.top + 80)
             screen.blit(minmax_depth_text, minmax_depth_rect)
-            round_time_text = pygame.font.Font(DEFAULT_FONT, 13).render("round time in sec:", True, SHIP_COVE_COLOR)
+            round_time_text = render_text("round time in sec:", 13, SHIP_COVE_COLOR)
             round_time_rect = round_time_text.get_rect(left=option_border.centerx + 30, top=option_border.top + 110)
             screen.blit(round_time_text, round_time_rect)
-            increment_time_text = pygame.font.Font(DEFAULT_FONT, 13).render("incr. time in sec:", True, SHIP_COVE_COLOR)
+            increment_time_text = render_text("incr. time in sec:", 13, SHIP_COVE_COLOR)
             increment_time_rect = round_time_text.get_rect(left=option_border.centerx + 30, top=option_border.top + 140)
             screen.blit(increment_time_text, increment_time_rect)
+            minmax_search_text = render_text("search:", 13, SHIP_COVE_COLOR)
+            minmax_search_rect = minmax_search_text.get_rect(left=option_border.centerx + 30,
+                                                             centery=option_border.top + 180)
+            screen.blit(minmax_search_text, minmax_search_rect)
+            self._update_toggle_buttons_group([self._minmax_search_alpha_beta_button, self._minmax_search_pvs_button],
+                                              screen, events)
 
     def get_values(self):
         player_name = None
@@ -275,6 +305,7 @@ class PlayerOptions:
         minmax_number_of_fields_value = None
         minmax_depth_value = None
         formulas_selection_value = None
+        minmax_search_value = None
         round_time_value = None
         increment_time_value = None
         if self._human_toggle_button.selected:
@@ -298,27 +329,28 @@ class PlayerOptions:
                            self._formulas_selection_learned_button]:
                 if button.selected:
                     formulas_selection_value = button.value
+            for button in [self._minmax_search_alpha_beta_button, self._minmax_search_pvs_button]:
+                if button.selected:
+                    minmax_search_value = button.value
             round_time_value = int(self._round_time_computer_input.value)
             increment_time_value = int(self._increment_time_computer_input.value)
         return ((self._player_id, player_name), minmax_option_value, evaluation_function_option_value,
                 minmax_number_of_fields_value, minmax_depth_value, formulas_selection_value, round_time_value,
-                increment_time_value)
+                increment_time_value, minmax_search_value)
 
 
 class Label:
-    def __init__(self, screen, size, left, top, text):
-        self._screen = screen
+    def __init__(self, size, left, top, text):
         self._size = size
         self._left = left
         self._top = top
-        self._font = pygame.font.Font(DEFAULT_FONT, self._size - 14)
-        self._text = self._font.render(text, True, SHIP_COVE_COLOR)
+        self._text = render_text(text, self._size - 14, SHIP_COVE_COLOR)
         self._text_rect = self._text.get_rect(center=(self._left + (self._size // 2), self._top + (self._size // 2)))
 
-    def draw(self):
+    def draw(self, surface):
         label = pygame.Rect(self._left, self._top, self._size, self._size)
-        pygame.draw.rect(self._screen, BLUE_WHALE_COLOR, label)
-        self._screen.blit(self._text, self._text_rect)
+        pygame.draw.rect(surface, BLUE_WHALE_COLOR, label)
+        surface.blit(self._text, self._text_rect)
 
 
 class Field:
@@ -327,22 +359,24 @@ class Field:
         self._size = size
         self._left = left
         self._top = top
-        self._font = pygame.font.Font(DEFAULT_FONT, self._size - 5)
         self._corrupted = False
         self._player = None
         self._text = None
         self._text_rect = None
+        self.rect = pygame.Rect(self._left, self._top, self._size, self._size)
         self.index = index
         self.won_field = False
         self.last_move = False
 
-    def draw(self, hovering=False):
-        label = pygame.Rect(self._left, self._top, self._size, self._size)
-        if hovering:
+    def draw_background(self, surface):
+        pygame.draw.rect(surface, BLUE_WHALE_COLOR, self.rect, 1)
+
+    def draw(self, background, hovering=False):
+        self._screen.blit(background, self.rect, self.rect)
+        if hovering and not self._corrupted:
             hovering_label = pygame.Rect(self._left + 1, self._top + 1, self._size - 2, self._size - 2)
             pygame.draw.rect(self._screen, DARK_GOLDENROD_COLOR, hovering_label)
         else:
-            pygame.draw.rect(self._screen, BLUE_WHALE_COLOR, label, 1)
             if self.won_field:
                 won_label = pygame.Rect(self._left + 1, self._top + 1, self._size - 2, self._size - 2)
                 pygame.draw.rect(self._screen, DARK_GOLDENROD_COLOR, won_label)
@@ -351,13 +385,7 @@ class Field:
                     last_move_label = pygame.Rect(self._left + 1, self._top + 1, self._size - 2, self._size - 2)
                     pygame.draw.rect(self._screen, DARK_GOLDENROD_COLOR, last_move_label, 2)
                 self._screen.blit(self._text, self._text_rect)
-
-    def change_color(self, x, y):
-        if not self._corrupted:
-            if x in range(self._left, self._left + self._size) and y in range(self._top, self._top + self._size):
-                self.draw(True)
-            else:
-                self.draw()
+        return self.rect
 
     def check_for_input(self, x, y):
         if not self._corrupted and x in range(self._left, self._left + self._size) and y in range(self._top,
@@ -369,10 +397,12 @@ class Field:
         if not self._corrupted:
             text = "X" if player == 0 else "O"
             color = MEDIUM_CARMINE_COLOR if player == 0 else SALEM_COLOR
-            self._text = self._font.render(text, True, color)
+            self._text = render_text(text, self._size - 5, color)
             self._text_rect = self._text.get_rect(
                 center=(self._left + (self._size // 2), self._top + (self._size // 2)))
             self._corrupted = True
+            return True
+        return False
 
 
 class Board:
@@ -383,8 +413,13 @@ class Board:
         self._top = top
         self._size = size
         self._square_size = self._size // (self._board_size + 1)
+        self.rect = pygame.Rect(self._left, self._top, self._square_size * (self._board_size + 1),
+                                self._square_size * (self._board_size + 1))
         self._labels = self._prepare_labels()
         self._fields = self._prepare_fields()
+        self._background = self._prepare_background()
+        self._hovered_field = None
+        self._dirty_fields = set()
 
     def _prepare_labels(self):
         labels = []
@@ -393,10 +428,10 @@ class Board:
                 if y == 0 and x == 0:
                     continue
                 if y == 0:
-                    labels.append(Label(self._screen, self._square_size, ((x * self._square_size) + self._left),
+                    labels.append(Label(self._square_size, ((x * self._square_size) + self._left),
                                         ((y * self._square_size) + self._top), str(x)))
             if y > 0:
-                labels.append(Label(self._screen, self._square_size, ((0 * self._square_size) + self._left),
+                labels.append(Label(self._square_size, ((0 * self._square_size) + self._left),
                                     ((y * self._square_size) + self._top), str(y)))
         return labels
 
@@ -409,6 +444,18 @@ class Board:
                                     (self._board_size * y) - (self._board_size - x)))
         return fields
 
+    def _prepare_background(self):
+        background = pygame.Surface(self._screen.get_size())
+        background.fill(BLUE_WHALE_COLOR)
+        board_background = pygame.Rect(self._left + self._square_size, self._top + self._square_size,
+                                       self._square_size * self._board_size, self._square_size * self._board_size)
+        pygame.draw.rect(background, WHITE_SMOKE_COLOR, board_background)
+        for label in self._labels:
+            label.draw(background)
+        for field in self._fields:
+            field.draw_background(background)
+        return background
+
     def _get_corrupted_fields_from_game_state(self, game_state):
         corrupted_fields = {}
         for i in range(1, self._board_size ** 2 + 1):
@@ -418,25 +465,38 @@ class Board:
                 corrupted_fields[i] = 1
         return corrupted_fields
 
+    def _set_hovered_field(self, hovered_field):
+        if hovered_field is not self._hovered_field:
+            self._dirty_fields.update(field for field in (self._hovered_field, hovered_field) if field is not None)
+            self._hovered_field = hovered_field
+
     def draw(self):
-        background = pygame.Rect(self._left + self._square_size, self._top + self._square_size,
-                                 self._square_size * self._board_size, self._square_size * self._board_size)
-        pygame.draw.rect(self._screen, WHITE_SMOKE_COLOR, background)
-        for label in self._labels:
-            label.draw()
+        self._screen.blit(self._background, self.rect, self.rect)
+        self._dirty_fields = set()
         for field in self._fields:
-            field.draw()
+            field.draw(self._background, field is self._hovered_field)
+        return self.rect
+
+    def draw_dirty_fields(self):
+        dirty_fields, self._dirty_fields = self._dirty_fields, set()
+        return [field.draw(self._background, field is self._hovered_field) for field in dirty_fields]
 
     def check_fields(self, x, y):
-        for field in self._fields:
-            field.change_color(x, y)
+        self._set_hovered_field(next((field for field in self._fields if field.check_for_input(x, y)), None))
+
+    def clear_hovered_field(self):
+        self._set_hovered_field(None)
 
     def update_fields(self, game_state, field_index):
         corrupted_fields = self._get_corrupted_fields_from_game_state(game_state)
         for field in self._fields:
             if field.index in corrupted_fields:
-                field.last_move = True if field.index == field_index else False
-                field.update(corrupted_fields[field.index])
+                last_move = field.index == field_index
+                if field.last_move != last_move:
+                    field.last_move = last_move
+                    self._dirty_fields.add(field)
+                if field.update(corrupted_fields[field.index]):
+                    self._dirty_fields.add(field)
 
     def check_for_input(self, x, y):
         for field in self._fields:
@@ -449,6 +509,7 @@ class Board:
             for field in self._fields:
                 if line_field == field.index:
                     field.won_field = True
+                    self._dirty_fields.add(field)
 
 
 class Game:
@@ -456,275 +517,224 @@ class Game:
         pygame.init()
         pygame.event.set_grab(True)
         pygame.display.set_caption("Gomoku")
-        pygame.display.set_icon(ICON)
+        icon = pygame.image.load(ICON_PATH)
+        pygame.display.set_icon(icon)
+        self._title_icon = pygame.transform.scale(icon, (70, 70))
         self._clock = pygame.time.Clock()
         self._board_size = board_size
         self._screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags=pygame.SCALED, vsync=1)
         self._first_player_options = PlayerOptions(0, 20, 150)
         self._second_player_options = PlayerOptions(1, 20, 391)
         self._ai = None
+        self._computer_move_requests = queue.Queue()
+        self._game_core_lock = threading.Lock()
+        self._computer_move_stop_search = None
+        self._current_move_uuid = None
 
     def _load_ai(self):
         self._ai = AI(self._board_size)
+        get_five_through_field(create_bitboard(self._board_size), 1, 0, self._board_size)
+        pygame.event.post(pygame.event.Event(AI_LOADED_EVENT))
 
     def _load_ai_thr(self):
         ai_loading_thread = threading.Thread(target=self._load_ai)
         ai_loading_thread.daemon = True
         ai_loading_thread.start()
 
-    def _transform_index_to_coordinate(self, index):
-        return ((index - 1) % self._board_size) + 1, math.ceil(index / self._board_size)
-
-    def _transform_coordinate_to_index(self, x, y):
-        return (self._board_size * y) - (self._board_size - x)
+    def _computer_move_worker(self):
+        while True:
+            request = self._computer_move_requests.get()
+            if not request[1][0]:
+                try:
+                    self._computer_move(*request)
+                except Exception:
+                    traceback.print_exc()
+                    with self._game_core_lock:
+                        if self._current_move_uuid == request[0]:
+                            self._computer_move_running = False
+
+    def _computer_move_worker_thr(self):
+        computer_move_worker_thread = threading.Thread(target=self._computer_move_worker)
+        computer_move_worker_thread.daemon = True
+        computer_move_worker_thread.start()
 
     def _draw_player_information(self, player_options_tuple, sign, sign_color, center_x, center_y):
-        sign_text = pygame.font.Font(DEFAULT_FONT, 20).render(sign, True, sign_color)
+        sign_text = render_text(sign, 20, sign_color)
         sign_rect = sign_text.get_rect(center=(center_x, center_y))
         self._screen.blit(sign_text, sign_rect)
-        if self._current_player == player_options_tuple and not self._game_ended:
+        if self._game_core.current_player == player_options_tuple and not self._game_core.game_ended:
             information_message = "player <"
             information_message_color = DARK_GOLDENROD_COLOR
         else:
             information_message = "player"
             information_message_color = SHIP_COVE_COLOR
-        information_text = pygame.font.Font(DEFAULT_FONT, 15).render(information_message, True,
-                                                                     information_message_color)
+        information_text = render_text(information_message, 15, information_message_color)
         information_rect = information_text.get_rect(left=sign_rect.right + 5, centery=540)
         self._screen.blit(information_text, information_rect)
-        player_text = pygame.font.Font(DEFAULT_FONT, 13).render(f"{player_options_tuple[0][1]}", True,
-                                                                SHIP_COVE_COLOR)
+        player_text = render_text(f"{player_options_tuple[0][1]}", 13, SHIP_COVE_COLOR)
         player_rect = player_text.get_rect(left=sign_rect.left + 5, top=sign_rect.bottom + 5)
         self._screen.blit(player_text, player_rect)
         if player_options_tuple[0][1] == "human":
-            round_time_text = pygame.font.Font(DEFAULT_FONT, 13).render(
-                f"round time = {player_options_tuple[6]} sec", True, SHIP_COVE_COLOR)
+            round_time_text = render_text(f"round time = {player_options_tuple[6]} sec", 13, SHIP_COVE_COLOR)
             round_time_rect = round_time_text.get_rect(left=sign_rect.left + 5, top=player_rect.bottom + 5)
             self._screen.blit(round_time_text, round_time_rect)
-            increment_time_text = pygame.font.Font(DEFAULT_FONT, 13).render(
-                f"increment time = {player_options_tuple[7]} sec", True, SHIP_COVE_COLOR)
+            increment_time_text = render_text(f"increment time = {player_options_tuple[7]} sec", 13, SHIP_COVE_COLOR)
             increment_time_rect = round_time_text.get_rect(left=sign_rect.left + 5, top=round_time_rect.bottom + 5)
             self._screen.blit(increment_time_text, increment_time_rect)
         if player_options_tuple[0][1] == "computer":
-            round_time_text = pygame.font.Font(DEFAULT_FONT, 13).render(
-                f"round time = {player_options_tuple[6]} sec", True, SHIP_COVE_COLOR)
+            round_time_text = render_text(f"round time = {player_options_tuple[6]} sec", 13, SHIP_COVE_COLOR)
             round_time_rect = round_time_text.get_rect(left=sign_rect.left + 5, top=player_rect.bottom + 5)
             self._screen.blit(round_time_text, round_time_rect)
-            increment_time_text = pygame.font.Font(DEFAULT_FONT, 13).render(
-                f"increment time = {player_options_tuple[7]} sec", True, SHIP_COVE_COLOR)
+            increment_time_text = render_text(f"increment time = {player_options_tuple[7]} sec", 13, SHIP_COVE_COLOR)
             increment_time_rect = round_time_text.get_rect(left=sign_rect.left + 5, top=round_time_rect.bottom + 5)
             self._screen.blit(increment_time_text, increment_time_rect)
             if player_options_tuple[1] == "fields chosen by formulas":
-                minmax_fields_selection_text = pygame.font.Font(DEFAULT_FONT, 13).render(
-                    f"{player_options_tuple[1]} = {player_options_tuple[3]}", True, SHIP_COVE_COLOR)
+                minmax_fields_selection_text = render_text(f"{player_options_tuple[1]} = {player_options_tuple[3]}", 13,
+                                                           SHIP_COVE_COLOR)
             else:
-                minmax_fields_selection_text = pygame.font.Font(DEFAULT_FONT, 13).render(
-                    f"{player_options_tuple[1]}", True, SHIP_COVE_COLOR)
+                minmax_fields_selection_text = render_text(f"{player_options_tuple[1]}", 13, SHIP_COVE_COLOR)
             minmax_fields_selection_rect = minmax_fields_selection_text.get_rect(left=sign_rect.left + 5,
                                                                                  top=increment_time_rect.bottom + 5)
             self._screen.blit(minmax_fields_selection_text, minmax_fields_selection_rect)
-            evaluation_function_text = pygame.font.Font(DEFAULT_FONT, 13).render(
-                f"evaluation function = {player_options_tuple[2]}", True, SHIP_COVE_COLOR)
+            evaluation_function_text = render_text(f"evaluation function = {player_options_tuple[2]}", 13,
+                                                   SHIP_COVE_COLOR)
             evaluation_function_rect = evaluation_function_text.get_rect(left=sign_rect.left + 5,
                                                                          top=minmax_fields_selection_rect.bottom + 5)
             self._screen.blit(evaluation_function_text, evaluation_function_rect)
-            minmax_depth_text = pygame.font.Font(DEFAULT_FONT, 13).render(
-                f"minmax depth = {player_options_tuple[4]}", True, SHIP_COVE_COLOR)
+            minmax_depth_text = render_text(f"minmax depth = {player_options_tuple[4]}", 13, SHIP_COVE_COLOR)
             minmax_depth_rect = evaluation_function_text.get_rect(left=sign_rect.left + 5,
                                                                   top=evaluation_function_rect.bottom + 5)
             self._screen.blit(minmax_depth_text, minmax_depth_rect)
             if player_options_tuple[1] == "fields chosen by formulas":
-                formula_selection_text = pygame.font.Font(DEFAULT_FONT, 13).render(
-                    f"formula selection = {player_options_tuple[5]}", True, SHIP_COVE_COLOR)
+                formula_selection_text = render_text(f"formula selection = {player_options_tuple[5]}", 13,
+                                                     SHIP_COVE_COLOR)
                 formula_selection_rect = formula_selection_text.get_rect(left=sign_rect.left + 5,
                                                                          top=minmax_depth_rect.bottom + 5)
                 self._screen.blit(formula_selection_text, formula_selection_rect)
 
     def _draw_information_message(self):
-        text = pygame.font.Font(DEFAULT_FONT, 20).render(self._information_message, True,
-                                                         DARK_GOLDENROD_COLOR if self._game_ended else SHIP_COVE_COLOR)
+        text = render_text(self._get_information_message(), 20,
+                           DARK_GOLDENROD_COLOR if self._game_core.game_ended else SHIP_COVE_COLOR)
         rect = text.get_rect(center=(485 - (text.get_size()[0] // 2), 22 + (text.get_size()[1] // 2)))
         self._screen.blit(text, rect)
 
     def _initialize_new_game(self, first_player_options_tuple, second_player_options_tuple):
+        self._cancel_computer_move()
+        if self._ai:
+            self._ai.stop_pondering()
         self._board = Board(self._board_size, self._screen, 15, 60, 470)
-        self._game_state = [0 for _ in range((self._board_size ** 2) * 2)]
-        self._first_player = first_player_options_tuple
-        self._second_player = second_player_options_tuple
-        self._current_player = self._first_player
-        self._first_player_round_time_limit = first_player_options_tuple[6]
-        self._second_player_round_time_limit = second_player_options_tuple[6]
-        self._first_player_round_time = first_player_options_tuple[6]
-        self._second_player_round_time = second_player_options_tuple[6]
-        self._first_player_increment_time = first_player_options_tuple[7]
-        self._second_player_increment_time = second_player_options_tuple[7]
-        self._information_message = "Game in progress•••"
-        self._moving_thread_running = False
-        self._game_ended = False
-        self._current_thread_uuid = None
+        self._game_core = GameCore(self._board_size, first_player_options_tuple, second_player_options_tuple)
+        self._computer_move_running = False
         self._timer = pygame.USEREVENT + 1
         pygame.time.set_timer(self._timer, 1000)
 
-    def _check_if_player_won(self):
-        bonus = 0 if self._first_player == self._current_player else 1
-        corrupted_fields = []
-        for index, value in enumerate(self._game_state[bonus::2]):
-            if value == 1:
-                corrupted_fields.append(self._transform_index_to_coordinate(index + 1))
-        if len(corrupted_fields) < 5:
-            return False, None
-        for y in range(1, self._board_size + 1):
-            fields = [corrupted_field for corrupted_field in corrupted_fields if corrupted_field[1] == y]
-            if len(fields) < 5:
-                continue
-            else:
-                for field in fields:
-                    unwanted_fields = [(field[0] - 1, y), (field[0] + 5, y)]
-                    if all(unwanted_field not in fields for unwanted_field in unwanted_fields):
-                        wanted_fields = [(field[0] + i, y) for i in range(1, 5)]
-                        if all(wanted_field in fields for wanted_field in wanted_fields):
-                            line_fields = [self._transform_coordinate_to_index(field[0], field[1])]
-                            [line_fields.append(self._transform_coordinate_to_index(wf[0], wf[1])) for wf in
-                             wanted_fields]
-                            return True, line_fields
-        for x in range(1, self._board_size + 1):
-            fields = [field for field in corrupted_fields if field[0] == x]
-            if len(fields) < 5:
-                continue
-            else:
-                for field in fields:
-                    unwanted_fields = [(x, field[1] - 1), (x, field[1] + 5)]
-                    if all(unwanted_field not in fields for unwanted_field in unwanted_fields):
-                        wanted_fields = [(x, field[1] + i) for i in range(1, 5)]
-                        if all(wanted_field in fields for wanted_field in wanted_fields):
-                            line_fields = [self._transform_coordinate_to_index(field[0], field[1])]
-                            [line_fields.append(self._transform_coordinate_to_index(wf[0], wf[1])) for wf in
-                             wanted_fields]
-                            return True, line_fields
-        for field in corrupted_fields:
-            unwanted_fields = [(field[0] - 1, field[1] - 1), (field[0] + 5, field[1] + 5)]
-            if all(unwanted_field not in corrupted_fields for unwanted_field in unwanted_fields):
-                wanted_fields = [(field[0] + i, field[1] + i) for i in range(1, 5)]
-                if all(wanted_field in corrupted_fields for wanted_field in wanted_fields):
-                    line_fields = [self._transform_coordinate_to_index(field[0], field[1])]
-                    [line_fields.append(self._transform_coordinate_to_index(wf[0], wf[1])) for wf in wanted_fields]
-                    return True, line_fields
-        for field in corrupted_fields:
-            unwanted_fields = [(field[0] + 1, field[1] - 1), (field[0] - 5, field[1] + 5)]
-            if all(unwanted_field not in corrupted_fields for unwanted_field in unwanted_fields):
-                wanted_fields = [(field[0] - i, field[1] + i) for i in range(1, 5)]
-                if all(wanted_field in corrupted_fields for wanted_field in wanted_fields):
-                    line_fields = [self._transform_coordinate_to_index(field[0], field[1])]
-                    [line_fields.append(self._transform_coordinate_to_index(wf[0], wf[1])) for wf in wanted_fields]
-                    return True, line_fields
-        return False, None
-
-    def _computer_move(self, thread_uuid):
-        self._moving_thread_running = True
-        computer_position_in_game_state = 0 if self._first_player == self._current_player else 1
-        field_index = self._ai.get_best_move(self._game_state, computer_position_in_game_state, self._current_player)
-        if self._current_thread_uuid == thread_uuid and not self._game_ended:
-            game_state_index = (field_index - 1) * 2
-            if self._first_player != self._current_player:
-                game_state_index += 1
-            self._game_state[game_state_index] = 1
-            self._update_player_time()
-            self._board.update_fields(self._game_state, field_index)
-            self._game_ended, line_fields = self._check_if_player_won()
-            if self._game_ended:
-                self._board.set_won_line(line_fields)
-                self._information_message = "First player won!" if self._current_player == self._first_player else "Second player won!"
-            else:
-                if self._current_player == self._first_player:
-                    self._current_player = self._second_player
-                else:
-                    self._current_player = self._first_player
-            self._moving_thread_running = False
-
-    def _computer_move_thr(self):
-        thread_uuid = uuid.uuid4()
-        self._current_thread_uuid = thread_uuid
-        computer_move_thread = threading.Thread(target=self._computer_move, args=(thread_uuid,))
-        computer_move_thread.daemon = True
-        computer_move_thread.start()
+    def _get_information_message(self):
+        if not self._game_core.game_ended:
+            return "Game in progress•••"
+        if self._game_core.winner is None:
+            return "Tie!"
+        return "First player won!" if self._game_core.winner == 0 else "Second player won!"
+
+    def _update_board(self, field_index):
+        self._board.update_fields(self._game_core.game_state, field_index)
+        if self._game_core.won_line:
+            self._board.set_won_line(self._game_core.won_line)
+
+    def _computer_move(self, move_uuid, stop_search, game_state, computer_position_in_game_state, player_options_tuple,
+                       remaining_time):
+        field_index = self._ai.get_best_move(game_state, computer_position_in_game_state, player_options_tuple,
+                                             remaining_time, stop_search)
+        with self._game_core_lock:
+            if self._current_move_uuid != move_uuid or self._game_core.game_ended:
+                return
+            self._game_core.make_move(field_index)
+            if PONDERING and not self._game_core.game_ended and self._game_core.current_player[0][1] == "human":
+                self._ai.start_pondering(self._game_core.game_state, computer_position_in_game_state,
+                                         player_options_tuple)
+            self._computer_move_running = False
+            pygame.event.post(pygame.event.Event(AI_MOVE_EVENT, game_core=self._game_core, field_index=field_index))
+
+    def _handle_computer_moves(self, events):
+        for event in events:
+            if event.type == AI_MOVE_EVENT and event.game_core is self._game_core:
+                self._update_board(event.field_index)
+
+    def _request_computer_move(self):
+        self._cancel_computer_move()
+        with self._game_core_lock:
+            self._current_move_uuid = uuid.uuid4()
+            self._computer_move_stop_search = create_stop_search()
+            self._computer_move_running = True
+        position = self._game_core.current_position
+        self._computer_move_requests.put((self._current_move_uuid, self._computer_move_stop_search,
+                                          list(self._game_core.game_state), position, self._game_core.current_player,
+                                          self._game_core.round_times[position]))
+
+    def _cancel_computer_move(self):
+        with self._game_core_lock:
+            self._current_move_uuid = None
+            self._computer_move_running = False
+            if self._computer_move_stop_search is not None:
+                self._computer_move_stop_search.fill(1)
 
     def _human_move(self, field_index):
-        game_state_index = (field_index - 1) * 2
-        if self._first_player != self._current_player:
-            game_state_index += 1
-        self._game_state[game_state_index] = 1
-        self._update_player_time()
-        self._board.update_fields(self._game_state, field_index)
-        self._game_ended, line_fields = self._check_if_player_won()
-        if self._game_ended:
-            self._board.set_won_line(line_fields)
-            self._information_message = "First player won!" if self._current_player == self._first_player else "Second player won!"
-        else:
-            if self._current_player == self._first_player:
-                self._current_player = self._second_player
-            else:
-                self._current_player = self._first_player
+        with self._game_core_lock:
+            self._game_core.make_move(field_index)
+        self._update_board(field_index)
+        if self._game_core.game_ended and self._ai:
+            self._ai.stop_pondering()
 
-    def _perform_player_move(self, mouse_coord, events):
-        if not self._game_ended:
-            if not self._moving_thread_running and self._current_player[0][1] == "human":
-                self._board.check_fields(mouse_coord[0], mouse_coord[1])
-                for event in events:
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        field_not_corrupted, field_index = self._board.check_for_input(mouse_coord[0], mouse_coord[1])
-                        if field_not_corrupted:
-                            self._human_move(field_index)
-            if not self._moving_thread_running and self._current_player[0][1] == "computer":
-                self._computer_move_thr()
+    def _is_player_turn(self, player_type):
+        return not self._game_core.game_ended and not self._computer_move_running and \
+            self._game_core.current_player[0][1] == player_type
 
-    def _handle_timer(self, events):
-        first_player_timer_color = SHIP_COVE_COLOR if self._first_player_round_time > 0 else MEDIUM_CARMINE_COLOR
-        first_player_timer_text = pygame.font.Font(DEFAULT_FONT, 15).render(
-            f"{(self._first_player_round_time // 3600):02} : {((self._first_player_round_time % 3600) // 60):02} : "
-            f"{(self._first_player_round_time % 60):02}", True, first_player_timer_color)
+    def _perform_player_move(self, mouse_coord, events):
+        if self._is_player_turn("human"):
+            self._board.check_fields(mouse_coord[0], mouse_coord[1])
+            for event in events:
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    field_not_corrupted, field_index = self._board.check_for_input(mouse_coord[0], mouse_coord[1])
+                    if field_not_corrupted:
+                        self._human_move(field_index)
+                        break
+        else:
+            self._board.clear_hovered_field()
+        if self._is_player_turn("computer"):
+            self._request_computer_move()
+
+    def _draw_timers(self):
+        first_player_round_time, second_player_round_time = self._game_core.round_times
+        first_player_timer_color = SHIP_COVE_COLOR if first_player_round_time > 0 else MEDIUM_CARMINE_COLOR
+        first_player_timer_text = render_text(
+            f"{(first_player_round_time // 3600):02} : {((first_player_round_time % 3600) // 60):02} : "
+            f"{(first_player_round_time % 60):02}", 15, first_player_timer_color)
         first_player_timer_rect = first_player_timer_text.get_rect(left=130, centery=540)
         self._screen.blit(first_player_timer_text, first_player_timer_rect)
-        second_player_timer_color = SHIP_COVE_COLOR if self._second_player_round_time > 0 else MEDIUM_CARMINE_COLOR
-        second_player_timer_text = pygame.font.Font(DEFAULT_FONT, 15).render(
-            f"{(self._second_player_round_time // 3600):02} : {((self._second_player_round_time % 3600) // 60):02} : "
-            f"{(self._second_player_round_time % 60):02}", True, second_player_timer_color)
+        second_player_timer_color = SHIP_COVE_COLOR if second_player_round_time > 0 else MEDIUM_CARMINE_COLOR
+        second_player_timer_text = render_text(
+            f"{(second_player_round_time // 3600):02} : {((second_player_round_time % 3600) // 60):02} : "
+            f"{(second_player_round_time % 60):02}", 15, second_player_timer_color)
         second_player_timer_rect = second_player_timer_text.get_rect(left=(SCREEN_WIDTH // 2) + 120, centery=540)
         self._screen.blit(second_player_timer_text, second_player_timer_rect)
+
+    def _handle_timer(self, events):
         for event in events:
             if event.type == self._timer:
-                if self._current_player == self._first_player and not self._game_ended:
-                    if self._first_player_round_time > 0:
-                        self._first_player_round_time -= 1
-                        if self._first_player_round_time == 0:
-                            pygame.time.set_timer(self._timer, 0)
-                            self._game_ended = True
-                            self._information_message = "Second player won!"
-                elif self._current_player == self._second_player and not self._game_ended:
-                    if self._second_player_round_time > 0:
-                        self._second_player_round_time -= 1
-                        if self._second_player_round_time == 0:
-                            pygame.time.set_timer(self._timer, 0)
-                            self._game_ended = True
-                            self._information_message = "First player won!"
-
-    def _update_player_time(self):
-        if self._current_player == self._first_player:
-            self._first_player_round_time += self._first_player_increment_time
-        else:
-            self._second_player_round_time += self._second_player_increment_time
+                with self._game_core_lock:
+                    if self._game_core.elapse_time(1):
+                        pygame.time.set_timer(self._timer, 0)
 
     def _main_menu(self):
+        events = pygame.event.get()
         while True:
             self._clock.tick(FPS)
-            events = pygame.event.get()
             mouse_coord = pygame.mouse.get_pos()
             self._screen.fill(BLUE_WHALE_COLOR)
-            title_text = pygame.font.Font(DEFAULT_FONT, 60).render("Gomoku", True, WHITE_SMOKE_COLOR)
+            title_text = render_text("Gomoku", 60, WHITE_SMOKE_COLOR)
             title_rect = title_text.get_rect(center=((SCREEN_WIDTH // 2) - 17, 80))
             self._screen.blit(title_text, title_rect)
-            title_icon = pygame.transform.scale(ICON, (70, 70))
-            title_icon_rect = title_icon.get_rect(center=((SCREEN_WIDTH // 2) + 110, 58))
-            self._screen.blit(title_icon, title_icon_rect)
+            title_icon_rect = self._title_icon.get_rect(center=((SCREEN_WIDTH // 2) + 110, 58))
+            self._screen.blit(self._title_icon, title_icon_rect)
             self._first_player_options.handle(self._screen, events)
             self._second_player_options.handle(self._screen, events)
             play_button = Button(90, 645, 140, 50, "Play", 35)
@@ -751,17 +761,18 @@ class Game:
                         pygame.quit()
                         sys.exit()
             pygame.display.update()
+            events = wait_for_events(MENU_EVENT_TIMEOUT)
 
     def _about_screen(self):
+        events = pygame.event.get()
         while True:
             self._clock.tick(FPS)
             self._screen.fill(BLUE_WHALE_COLOR)
-            title_text = pygame.font.Font(DEFAULT_FONT, 60).render("Gomoku", True, WHITE_SMOKE_COLOR)
+            title_text = render_text("Gomoku", 60, WHITE_SMOKE_COLOR)
             title_rect = title_text.get_rect(center=((SCREEN_WIDTH // 2) - 17, 120))
             self._screen.blit(title_text, title_rect)
-            title_icon = pygame.transform.scale(ICON, (70, 70))
-            title_icon_rect = title_icon.get_rect(center=((SCREEN_WIDTH // 2) + 110, 98))
-            self._screen.blit(title_icon, title_icon_rect)
+            title_icon_rect = self._title_icon.get_rect(center=((SCREEN_WIDTH // 2) + 110, 98))
+            self._screen.blit(self._title_icon, title_icon_rect)
             content_lines = ["Gomoku is a two-player strategy game that involves",
                              "placing pawns on a board. The object of the game is to",
                              "arrange 5 pawns in a row, vertically, horizontally or",
@@ -772,11 +783,10 @@ class Game:
                              "The author of open source Yoster Island fonts used in",
                              "the program is codeman38."]
             for index, line in enumerate(content_lines):
-                line_text = pygame.font.Font(DEFAULT_FONT, 13).render(line, True, SHIP_COVE_COLOR)
+                line_text = render_text(line, 13, SHIP_COVE_COLOR)
                 line_rect = line_text.get_rect(topleft=(40, 240 + (20 * index)))
                 self._screen.blit(line_text, line_rect)
             mouse_coord = pygame.mouse.get_pos()
-            events = pygame.event.get()
             menu_button = Button(SCREEN_WIDTH // 2, 645, 140, 50, "Menu", 35)
             for button in [menu_button]:
                 button.change_color(mouse_coord[0], mouse_coord[1])
@@ -789,25 +799,26 @@ class Game:
                     if menu_button.check_for_input(mouse_coord[0], mouse_coord[1]):
                         self._main_menu()
             pygame.display.update()
+            events = wait_for_events(MENU_EVENT_TIMEOUT)
 
     def _loading_screen(self, first_player_options_tuple, second_player_options_tuple):
         loading_message_update_interval = 500
         last_loading_message_update = pygame.time.get_ticks()
         loading_message = "loading formulas"
         current_dot_numbers = 0
+        events = pygame.event.get()
         while True:
             self._clock.tick(FPS)
             if self._ai:
                 self._start_game(first_player_options_tuple, second_player_options_tuple)
             else:
                 self._screen.fill(BLUE_WHALE_COLOR)
-                title_text = pygame.font.Font(DEFAULT_FONT, 60).render("Gomoku", True, WHITE_SMOKE_COLOR)
+                title_text = render_text("Gomoku", 60, WHITE_SMOKE_COLOR)
                 title_rect = title_text.get_rect(center=((SCREEN_WIDTH // 2) - 17, 200))
                 self._screen.blit(title_text, title_rect)
-                title_icon = pygame.transform.scale(ICON, (70, 70))
-                title_icon_rect = title_icon.get_rect(center=((SCREEN_WIDTH // 2) + 110, 178))
-                self._screen.blit(title_icon, title_icon_rect)
-                loading_text = pygame.font.Font(DEFAULT_FONT, 20).render(loading_message, True, SHIP_COVE_COLOR)
+                title_icon_rect = self._title_icon.get_rect(center=((SCREEN_WIDTH // 2) + 110, 178))
+                self._screen.blit(self._title_icon, title_icon_rect)
+                loading_text = render_text(loading_message, 20, SHIP_COVE_COLOR)
                 loading_rect = loading_text.get_rect(left=150, centery=500)
                 self._screen.blit(loading_text, loading_rect)
                 current_time = pygame.time.get_ticks()
@@ -819,29 +830,25 @@ class Game:
                     else:
                         current_dot_numbers += 1
                         loading_message += "•"
-                for event in pygame.event.get():
+                for event in events:
                     if event.type == pygame.QUIT:
                         pygame.quit()
                         sys.exit()
                 pygame.display.update()
+                events = wait_for_events(MENU_EVENT_TIMEOUT)
 
     def _start_game(self, first_player_options_tuple, second_player_options_tuple):
         self._initialize_new_game(first_player_options_tuple, second_player_options_tuple)
+        menu_button = Button(55, 32, 80, 30, "Menu", 20)
+        restart_button = Button(160, 32, 110, 30, "Restart", 20)
+        drawn_board = None
+        header_state = None
+        information_state = None
+        events = pygame.event.get()
         while True:
             self._clock.tick(FPS)
-            self._screen.fill(BLUE_WHALE_COLOR)
-            self._draw_information_message()
-            self._board.draw()
             mouse_coord = pygame.mouse.get_pos()
-            events = pygame.event.get()
-            menu_button = Button(55, 32, 80, 30, "Menu", 20)
-            restart_button = Button(160, 32, 110, 30, "Restart", 20)
-            for button in [menu_button, restart_button]:
-                button.change_color(mouse_coord[0], mouse_coord[1])
-                button.update(self._screen)
-            if self._game_state.count(1) == self._board_size ** 2:
-                self._game_ended = True
-                self._information_message = "Tie!"
+            self._handle_computer_moves(events)
             self._perform_player_move(mouse_coord, events)
             for event in events:
                 if event.type == pygame.QUIT:
@@ -849,16 +856,52 @@ class Game:
                     sys.exit()
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if menu_button.check_for_input(mouse_coord[0], mouse_coord[1]):
+                        self._cancel_computer_move()
+                        if self._ai:
+                            self._ai.stop_pondering()
                         self._main_menu()
                     if restart_button.check_for_input(mouse_coord[0], mouse_coord[1]):
                         self._initialize_new_game(first_player_options_tuple, second_player_options_tuple)
             self._handle_timer(events)
-            self._draw_player_information(first_player_options_tuple, "X", MEDIUM_CARMINE_COLOR, 30, 540)
-            self._draw_player_information(second_player_options_tuple, "O", SALEM_COLOR, (SCREEN_WIDTH // 2) + 20, 540)
-            pygame.display.update()
+            dirty_rects = []
+            if drawn_board is not self._board:
+                drawn_board = self._board
+                header_state = None
+                information_state = None
+                self._screen.fill(BLUE_WHALE_COLOR)
+                dirty_rects.append(self._board.draw())
+            header_rect = pygame.Rect(0, 0, SCREEN_WIDTH, self._board.rect.top)
+            new_header_state = (menu_button.check_for_input(mouse_coord[0], mouse_coord[1]),
+                                restart_button.check_for_input(mouse_coord[0], mouse_coord[1]),
+                                self._get_information_message())
+            if new_header_state != header_state:
+                header_state = new_header_state
+                self._screen.fill(BLUE_WHALE_COLOR, header_rect)
+                self._draw_information_message()
+                for button in [menu_button, restart_button]:
+                    button.change_color(mouse_coord[0], mouse_coord[1])
+                    button.update(self._screen)
+                dirty_rects.append(header_rect)
+            information_rect = pygame.Rect(0, self._board.rect.bottom, SCREEN_WIDTH,
+                                           SCREEN_HEIGHT - self._board.rect.bottom)
+            new_information_state = (tuple(self._game_core.round_times), self._game_core.current_position,
+                                     self._game_core.game_ended)
+            if new_information_state != information_state:
+                information_state = new_information_state
+                self._screen.fill(BLUE_WHALE_COLOR, information_rect)
+                self._draw_timers()
+                self._draw_player_information(first_player_options_tuple, "X", MEDIUM_CARMINE_COLOR, 30, 540)
+                self._draw_player_information(second_player_options_tuple, "O", SALEM_COLOR,
+                                              (SCREEN_WIDTH // 2) + 20, 540)
+                dirty_rects.append(information_rect)
+            dirty_rects.extend(self._board.draw_dirty_fields())
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+            events = wait_for_events(GAME_EVENT_TIMEOUT)
 
     def run(self):
         self._load_ai_thr()
+        self._computer_move_worker_thr()
         self._main_menu()
 
 
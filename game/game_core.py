@@ -0,0 +1,59 @@
+from bitboard import create_bitboard, get_five_through_field, make_move
+
+
+class GameCore:
+    def __init__(self, board_size, first_player_options_tuple, second_player_options_tuple, opening_moves=()):
+        self.board_size = board_size
+        self.players = (first_player_options_tuple, second_player_options_tuple)
+        self.game_state = [0 for _ in range((board_size ** 2) * 2)]
+        self.bitboard = create_bitboard(board_size)
+        self.round_times = [first_player_options_tuple[6], second_player_options_tuple[6]]
+        self.increment_times = [first_player_options_tuple[7], second_player_options_tuple[7]]
+        self.number_of_moves = 0
+        self.current_position = 0
+        self.game_ended = False
+        self.winner = None
+        self.won_line = None
+        for field in opening_moves:
+            self._place_stone(field)
+            self.current_position = 1 - self.current_position
+
+    @property
+    def current_player(self):
+        return self.players[self.current_position]
+
+    def _place_stone(self, field):
+        self.game_state[((field - 1) * 2) + self.current_position] = 1
+        make_move(self.bitboard, field, self.current_position, self.board_size)
+        self.number_of_moves += 1
+
+    def is_legal_move(self, field):
+        return not self.game_ended and 1 <= field <= self.board_size ** 2 and \
+            self.game_state[(field - 1) * 2] == 0 and self.game_state[((field - 1) * 2) + 1] == 0
+
+    def make_move(self, field):
+        if not self.is_legal_move(field):
+            raise ValueError(f"illegal move {field}")
+        position = self.current_position
+        self._place_stone(field)
+        self.round_times[position] += self.increment_times[position]
+        line_fields = get_five_through_field(self.bitboard, field, position, self.board_size)
+        if len(line_fields) > 0:
+            self.game_ended = True
+            self.winner = position
+            self.won_line = [int(line_field) for line_field in line_fields]
+        elif self.number_of_moves == self.board_size ** 2:
+            self.game_ended = True
+        else:
+            self.current_position = 1 - position
+        return self.game_ended
+
+    def elapse_time(self, seconds):
+        if self.game_ended:
+            return False
+        position = self.current_position
+        self.round_times[position] = max(self.round_times[position] - seconds, 0)
+        if self.round_times[position] == 0:
+            self.game_ended = True
+            self.winner = 1 - position
+        return self.game_ended
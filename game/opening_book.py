@@ -0,0 +1,129 @@
+import glob
+import os
+import random
+from collections import Counter
+from pathlib import Path
+
+import numpy
+from numpy import array, bitwise_xor, int16, int32, uint64, zeros
+
+from formulas import count_satisfied_formulas_batch, create_batch_formula_family, load_formulas
+from transposition_table import ZOBRIST_SEED, create_zobrist_keys
+
+BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+BOARD_SIZE = 15
+OPENING_BOOK_VERSION = 1
+OPENING_BOOK_PLIES = 10
+OPENING_FIELDS = 10
+OPENING_BOOK_PATH = BASE_DIR.joinpath("book/opening_book.npz")
+PSQ_FILES_PATH = BASE_DIR.parent.joinpath("data-processing/psq/main")
+
+
+def read_psq_file(file_path, board_size):
+    with open(file_path, "r") as file:
+        data = [line.rstrip('\n') for line in file]
+    try:
+        board_sizes = data[0].split(",")[0].split()[1].split("x")
+    except IndexError:
+        return None
+    if board_sizes[0] != board_sizes[1] or int(board_sizes[0]) != board_size:
+        return None
+    moves = []
+    for line in data[1:]:
+        values = line.split(",")
+        if len(values) == 3 and all(value.isdigit() for value in values):
+            x, y = int(values[0]), int(values[1])
+            if not (0 < x <= board_size and 0 < y <= board_size):
+                return None
+            moves.append((board_size * y) - (board_size - x))
+    return moves if len(moves) == len(set(moves)) else None
+
+
+def create_symmetries(board_size):
+    field_symmetries = zeros((8, (board_size ** 2) + 1), dtype=int16)
+    for field in range(1, (board_size ** 2) + 1):
+        x, y = ((field - 1) % board_size) + 1, ((field - 1) // board_size) + 1
+        for symmetry, (symmetric_x, symmetric_y) in enumerate((
+                (x, y), (board_size - x + 1, y), (x, board_size - y + 1), (board_size - x + 1, board_size - y + 1),
+                (y, x), (board_size - y + 1, x), (y, board_size - x + 1), (board_size - y + 1, board_size - x + 1))):
+            field_symmetries[symmetry, field] = (board_size * symmetric_y) - (board_size - symmetric_x)
+    inverse_field_symmetries = zeros(field_symmetries.shape, dtype=int16)
+    for symmetry in range(8):
+        inverse_field_symmetries[symmetry, field_symmetries[symmetry]] = range((board_size ** 2) + 1)
+    columns = numpy.arange((board_size ** 2) * 2)
+    column_symmetries = ((field_symmetries[:, (columns // 2) + 1] - 1) * 2) + (columns % 2)
+    return field_symmetries, inverse_field_symmetries, column_symmetries
+
+
+def get_canonical_position(zobrist_keys, column_symmetries, columns):
+    hash_keys = [bitwise_xor.reduce(zobrist_keys[column_symmetries[symmetry, columns]], initial=uint64(0)) for
+                 symmetry in range(len(column_symmetries))]
+    symmetry = min(range(len(hash_keys)), key=hash_keys.__getitem__)
+    return hash_keys[symmetry], symmetry
+
+
+def get_opening_fields(board_size, number_of_fields):
+    main_scores = count_satisfied_formulas_batch(create_batch_formula_family(load_formulas(board_size)["main"]),
+                                                 zeros((board_size ** 2) * 2, dtype=int16))[0]
+    scores = [(main_scores[((field - 1) * 2) + 1] - main_scores[(field - 1) * 2], field) for field in
+              range(1, (board_size ** 2) + 1)]
+    return [field for _, field in sorted(scores, reverse=True)[:number_of_fields]]
+
+
+def build_opening_book(board_size=BOARD_SIZE, plies=OPENING_BOOK_PLIES, book_path=OPENING_BOOK_PATH):
+    zobrist_keys = create_zobrist_keys((board_size ** 2) * 2)
+    field_symmetries, _, column_symmetries = create_symmetries(board_size)
+    entries = Counter({(0, field): 1 for field in get_opening_fields(board_size, OPENING_FIELDS)})
+    for file_path in sorted(glob.glob(str(PSQ_FILES_PATH.joinpath("*.psq")))):
+        moves = read_psq_file(file_path, board_size)
+        if not moves:
+            continue
+        columns = []
+        for ply, field in enumerate(moves[:plies]):
+            if ply > 0:
+                hash_key, symmetry = get_canonical_position(zobrist_keys, column_symmetries,
+                                                            array(columns, dtype=int32))
+                entries[(int(hash_key), int(field_symmetries[symmetry, field]))] += 1
+            columns.append(((field - 1) * 2) + (ply % 2))
+    entries = sorted(entries.items())
+    os.makedirs(book_path.parent, exist_ok=True)
+    numpy.savez_compressed(book_path, version=array(OPENING_BOOK_VERSION), board_size=array(board_size),
+                           zobrist_seed=array(ZOBRIST_SEED), plies=array(plies),
+                           keys=array([entry[0][0] for entry in entries], dtype=uint64),
+                           fields=array([entry[0][1] for entry in entries], dtype=int16),
+                           counts=array([entry[1] for entry in entries], dtype=int32))
+
+
+def load_opening_book(board_size, book_path=OPENING_BOOK_PATH):
+    try:
+        with numpy.load(book_path) as data:
+            if (int(data["version"]) != OPENING_BOOK_VERSION or int(data["board_size"]) != board_size or
+                    int(data["zobrist_seed"]) != ZOBRIST_SEED):
+                return None
+            _, inverse_field_symmetries, column_symmetries = create_symmetries(board_size)
+            return (data["keys"], data["fields"], data["counts"], int(data["plies"]), inverse_field_symmetries,
+                    column_symmetries)
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def get_opening_book_field(opening_book, zobrist_keys, game_state):
+    keys, fields, counts, plies, inverse_field_symmetries, column_symmetries = opening_book
+    columns = numpy.flatnonzero(game_state)
+    if len(columns) >= plies:
+        return 0
+    hash_key, symmetry = get_canonical_position(zobrist_keys, column_symmetries, columns)
+    start = numpy.searchsorted(keys, hash_key, side="left")
+    end = numpy.searchsorted(keys, hash_key, side="right")
+    if start == end:
+        return 0
+    field = random.choices(fields[start:end], weights=counts[start:end])[0]
+    return int(inverse_field_symmetries[symmetry, field])
+
+
+def main():
+    build_opening_book()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+BOARD_SIZE = 15
+NUMBER_OF_RUNS = 2
+PLAYER_OPTIONS_TUPLE = ((0, "computer"), "fields chosen by formulas", "on", 5, 3, "all", 300, 5, "pvs")
+
+FIRST_MOVE_SCRIPT = """
+import json
+import time
+start_time = time.perf_counter()
+from numpy import int16, zeros
+from ai import AI
+ai = AI({board_size}, use_opening_book=False)
+initialized_time = time.perf_counter()
+game_state = zeros(({board_size} ** 2) * 2, dtype=int16)
+game_state[0] = 1
+game_state[3] = 1
+field = ai.get_best_move(game_state, 0, {player_options_tuple})
+end_time = time.perf_counter()
+ai.clear_transposition_tables()
+ai.get_best_move(game_state, 0, {player_options_tuple})
+search_time = time.perf_counter() - end_time
+print(json.dumps({{"initialization": initialized_time - start_time, "first_move": end_time - initialized_time,
+                  "time_to_first_move": end_time - start_time, "search": search_time, "field": field}}))
+"""
+
+
+def measure_time_to_first_move(cache_dir, board_size, player_options_tuple):
+    environment = dict(os.environ, NUMBA_CACHE_DIR=cache_dir)
+    script = FIRST_MOVE_SCRIPT.format(board_size=board_size, player_options_tuple=repr(player_options_tuple))
+    result = subprocess.run([sys.executable, "-c", script], cwd=BASE_DIR, env=environment, capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_startup_benchmark(board_size=BOARD_SIZE, number_of_runs=NUMBER_OF_RUNS,
+                          player_options_tuple=PLAYER_OPTIONS_TUPLE):
+    results = {"cold": [], "warm": []}
+    for _ in range(number_of_runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            results["cold"].append(measure_time_to_first_move(cache_dir, board_size, player_options_tuple))
+            results["warm"].append(measure_time_to_first_move(cache_dir, board_size, player_options_tuple))
+    return results
+
+
+def main():
+    results = run_startup_benchmark()
+    for start, measurements in results.items():
+        for key in ("initialization", "first_move", "time_to_first_move", "search"):
+            values = [measurement[key] for measurement in measurements]
+            print(f"{start} {key}: min {min(values):.2f}s, mean {sum(values) / len(values):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from numba import njit
+from numpy import float64, int8, int16, int64, random, uint8, uint64, zeros
+
+TRANSPOSITION_TABLE_SIZE = 2 ** 19
+ZOBRIST_SEED = 2023
+EXACT_BOUND = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+def create_zobrist_keys(number_of_columns):
+    return random.default_rng(ZOBRIST_SEED).integers(1, 2 ** 64 - 1, size=number_of_columns, dtype=uint64)
+
+
+def create_transposition_table(size=TRANSPOSITION_TABLE_SIZE):
+    return (zeros(size, dtype=uint64), zeros(size, dtype=int8), zeros(size, dtype=int8), zeros(size, dtype=float64),
+            zeros(size, dtype=int16), zeros(size, dtype=uint8), zeros(1, dtype=uint8))
+
+
+def start_new_search(transposition_table):
+    transposition_table[6][0] += 1
+
+
+@njit(nogil=True, cache=True)
+def compute_hash_key(zobrist_keys, game_state):
+    hash_key = uint64(0)
+    for column in range(len(game_state)):
+        if game_state[column] == 1:
+            hash_key ^= zobrist_keys[column]
+    return hash_key
+
+
+@njit(nogil=True, cache=True)
+def probe_transposition_table(transposition_table, hash_key):
+    keys, depths = transposition_table[0], transposition_table[1]
+    entry = int64(hash_key & uint64(len(keys) - 1))
+    if keys[entry] == hash_key and depths[entry] > 0:
+        return entry
+    return int64(-1)
+
+
+@njit(nogil=True, cache=True)
+def store_transposition_table(transposition_table, hash_key, depth, bound, score, field):
+    keys, depths, bounds, scores, fields, generations, current_generation = transposition_table
+    entry = int64(hash_key & uint64(len(keys) - 1))
+    if keys[entry] == hash_key or generations[entry] != current_generation[0] or depth >= depths[entry]:
+        keys[entry] = hash_key
+        depths[entry] = depth
+        bounds[entry] = bound
+        scores[entry] = score
+        fields[entry] = field
+        generations[entry] = current_generation[0]